@@ -0,0 +1,190 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""Time and memory of converting synthetic projects, `parse_model`, `declare`, `declare_table`, `transfer` and `autoload`.
+
+  $ python benchmarks/bench_conversion.py --sizes 100 1000 5000 --output result.json
+  $ python benchmarks/bench_conversion.py --sizes 100 1000 --baseline result.json  # exits with 1 on regressions
+
+Each size runs in a fresh interpreter against SQLite, so it does not need database servers.
+The projects are written by `synthetic.write_project` into a temporary directory and never migrated.
+GeoDjango fields are added if GeoAlchemy2 is installed and GDAL is found
+(``GDAL_LIBRARY_PATH`` and ``GEOS_LIBRARY_PATH`` environment variables are passed to the settings).
+"""
+import argparse
+import gc
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import OrderedDict
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+PHASES = ['setup', 'import', 'parse', 'declare', 'configure', 'declare_table', 'transfer', 'autoload']
+
+
+def configure(apps=()):
+    from django.conf import settings
+    options = {k: os.environ[k] for k in ('GDAL_LIBRARY_PATH', 'GEOS_LIBRARY_PATH') if k in os.environ}
+    settings.configure(
+        INSTALLED_APPS=list(apps),
+        DATABASES={'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': ':memory:'}},
+        **options
+    )
+
+
+def geo_available():
+    if importlib.util.find_spec('geoalchemy2') is None:
+        return False
+    try:
+        from django.contrib.gis.db import models  # noqa: F401
+    except Exception:
+        # GDAL is not found.
+        return False
+    return True
+
+
+def measure(func, trace_memory):
+    """It returns seconds, peak and retained bytes of calling the function."""
+    gc.collect()
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    kept = func()
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory() if trace_memory else (0, 0)
+    if trace_memory:
+        tracemalloc.stop()
+    del kept
+    return OrderedDict([('seconds', elapsed), ('peak', peak), ('retained', current)])
+
+
+def run_child(root, apps, trace_memory):
+    """It converts the project in this process, and returns results per phase."""
+    sys.path.insert(0, root)
+    configure(apps)
+    results = OrderedDict()
+    import django
+    results['setup'] = measure(django.setup, trace_memory)
+
+    base = set(sys.modules)
+    results['import'] = measure(lambda: importlib.import_module('d2a'), trace_memory)
+    results['import']['modules'] = len(set(sys.modules) - base)
+
+    import d2a
+    from django.apps import apps as django_apps
+    from sqlalchemy.orm import configure_mappers
+    models = [m for m in django_apps.get_models(include_auto_created=True) if m._meta.app_label in apps]
+    ordered = d2a._with_dependencies(models)
+
+    def parse():
+        return [d2a.parse_model(m) for m in models]
+
+    def declare():
+        d2a._model_infos.clear()
+        return [d2a.declare(m, database='declare') for m in ordered]
+
+    def declare_table():
+        d2a._model_infos.clear()
+        return [d2a.declare_table(m, database='declare_table') for m in ordered]
+
+    def transfer():
+        d2a._model_infos.clear()
+        for app in apps:
+            d2a.transfer(importlib.import_module(app + '.models'), {}, database='transfer')
+
+    def autoload():
+        d2a._model_infos.clear()
+        d2a.autoload({'module': 'models_sqla', 'option': {'database': 'autoload'}})
+
+    results['parse'] = measure(parse, trace_memory)
+    results['declare'] = measure(declare, trace_memory)
+    results['configure'] = measure(configure_mappers, trace_memory)
+    results['declare_table'] = measure(declare_table, trace_memory)
+    results['transfer'] = measure(transfer, trace_memory)
+    results['autoload'] = measure(autoload, trace_memory)
+    results['models'] = len(models)
+    return results
+
+
+def run_size(size, args, geo):
+    with tempfile.TemporaryDirectory(prefix='d2a_bench_') as root:
+        from synthetic import write_project
+        apps = write_project(root, size, models_per_app=args.models_per_app, num_fields=args.fields, geo=geo)
+        command = [sys.executable, os.path.abspath(__file__), '--child', root] + apps
+        if args.no_memory:
+            command.append('--no-memory')
+        out = subprocess.run(command, check=True, stdout=subprocess.PIPE, universal_newlines=True)
+    return json.loads(out.stdout.splitlines()[-1])
+
+
+def report(results):
+    print('{:>6} {:>7} {:<14} {:>10} {:>12} {:>14}'.format('size', 'models', 'phase', 'time[s]', 'peak[KiB]', 'retained[KiB]'))
+    for size, result in results.items():
+        for phase in PHASES:
+            row = result[phase]
+            print('{:>6} {:>7} {:<14} {:>10.3f} {:>12.0f} {:>14.0f}'.format(
+                size, result['models'], phase, row['seconds'], row['peak'] / 1024, row['retained'] / 1024))
+
+
+def regressions(results, baseline, tolerance):
+    """It returns messages of phases which are slower or larger than the baseline by more than the tolerance."""
+    messages = []
+    for size, result in results.items():
+        for phase in PHASES:
+            old = baseline.get(size, {}).get(phase)
+            if not old:
+                continue
+            for key in ('seconds', 'peak'):
+                if old[key] and result[phase][key] > old[key] * (1 + tolerance):
+                    messages.append('{} models, {}: {} {:.3g} -> {:.3g} ({:+.0%})'.format(
+                        size, phase, key, old[key], result[phase][key], result[phase][key] / old[key] - 1))
+    return messages
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 5000], help='Num of models per project.')
+    parser.add_argument('--models-per-app', type=int, default=50)
+    parser.add_argument('--fields', type=int, default=12, help='Num of fields per model except for relations.')
+    parser.add_argument('--geo', choices=['auto', 'yes', 'no'], default='auto', help='Whether geometry fields are added.')
+    parser.add_argument('--no-memory', action='store_true', help='Does not trace memory, which makes it slow.')
+    parser.add_argument('--output', help='Writes the results into the file as JSON.')
+    parser.add_argument('--baseline', help='Results written by --output, which the results are compared with.')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='Allowed ratio of increase from the baseline.')
+    parser.add_argument('--child', nargs='+', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        root, apps = args.child[0], args.child[1:]
+        print(json.dumps(run_child(root, apps, not args.no_memory)))
+        return
+
+    sys.path.insert(0, HERE)
+    configure()
+    import django
+    django.setup()
+    geo = {'yes': True, 'no': False}.get(args.geo)
+    if geo is None:
+        geo = geo_available()
+    print('geometry fields: {}'.format('included' if geo else 'skipped'))
+
+    results = OrderedDict((str(size), run_size(size, args, geo)) for size in args.sizes)
+    report(results)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            messages = regressions(results, json.load(f), args.tolerance)
+        for message in messages:
+            print('REGRESSION ' + message)
+        if messages:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""Memory retained by parsed field info and declared schema (orm classes or tables) of a synthetic large project.
+
+  $ python benchmarks/bench_declare.py --models 1000 --fields 20
+
+It does not need database servers, the models are made on the fly and never migrated.
+"""
+import argparse
+import gc
+import os
+import time
+import tracemalloc
+from collections import OrderedDict
+
+import django
+from django.conf import settings
+
+if not os.environ.get('DJANGO_SETTINGS_MODULE'):
+    settings.configure(
+        INSTALLED_APPS=['django.contrib.contenttypes'],
+        DATABASES={'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': ':memory:'}},
+    )
+django.setup()
+
+from django.db import models  # noqa: E402
+
+import d2a  # noqa: E402
+from d2a.parsers import parse_field, FieldInfo  # noqa: E402
+
+
+class CustomEmailField(models.EmailField):
+    pass
+
+
+FIELDS = [
+    lambda i: models.CharField(max_length=(50, 100, 255)[i % 3]),
+    lambda i: models.IntegerField(null=True),
+    lambda i: models.DecimalField(max_digits=10, decimal_places=2),
+    lambda i: models.DateTimeField(auto_now_add=True),
+    lambda i: models.BooleanField(default=False),
+    lambda i: models.TextField(blank=True),
+    lambda i: CustomEmailField(max_length=254),
+    lambda i: models.BigIntegerField(),
+]
+
+
+def make_models(num_models, num_fields):
+    result = []
+    for i in range(num_models):
+        attrs = OrderedDict([('__module__', __name__), ('Meta', type('Meta', (), {'app_label': 'bench'}))])
+        for j in range(num_fields):
+            attrs['f{}'.format(j)] = FIELDS[j % len(FIELDS)](j)
+        if result:
+            attrs['parent'] = models.ForeignKey(result[-1], on_delete=models.CASCADE, related_name='+')
+        result.append(type('Model{}'.format(i), (models.Model,), attrs))
+    return result
+
+
+def measure(func):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    kept = func()
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return elapsed, current, peak
+
+
+def declare_all(django_models, infos, database):
+    registry = d2a.get_registry('postgresql', database)
+    for model in django_models:
+        d2a.declare(model, db_type='postgresql', model_info=infos[model], database=database)
+    return registry
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--models', type=int, default=1000)
+    parser.add_argument('--fields', type=int, default=20)
+    args = parser.parse_args()
+
+    django_models = make_models(args.models, args.fields)
+    infos = {model: d2a.parsers.parse_model(model) for model in django_models}
+    make_type = d2a._make_type
+
+    def new_types():
+        d2a._make_type = lambda col_type, type_kwargs: col_type(**type_kwargs)
+        try:
+            return declare_all(django_models, infos, 'new_types')
+        finally:
+            d2a._make_type = make_type
+
+    cases = [
+        ('parse: dict', lambda: [[parse_field(f) for f in m._meta.fields] for m in django_models]),
+        ('parse: FieldInfo', lambda: [[FieldInfo(parse_field(f)) for f in m._meta.fields] for m in django_models]),
+        ('declare: new types', new_types),
+        ('declare: shared types', lambda: declare_all(django_models, infos, 'shared_types')),
+        ('declare_table', lambda: [
+            d2a.declare_table(m, db_type='postgresql', model_info=infos[m], database='tables') for m in django_models]),
+    ]
+    print('{} models x {} fields'.format(args.models, args.fields + 2))
+    print('{:<22} {:>10} {:>14} {:>14}'.format('case', 'time[s]', 'retained[KiB]', 'peak[KiB]'))
+    for name, func in cases:
+        elapsed, current, peak = measure(func)
+        print('{:<22} {:>10.3f} {:>14.0f} {:>14.0f}'.format(name, elapsed, current / 1024, peak / 1024))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""Time and modules of ``import d2a`` in a fresh interpreter.
+
+  $ python benchmarks/bench_import.py --repeat 5
+
+Django and SQLAlchemy are imported beforehand, so only what d2a adds is counted.
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+CHILD = r'''
+import json, sys, time
+import django
+from django.conf import settings
+settings.configure(
+    INSTALLED_APPS=['django.contrib.contenttypes'],
+    DATABASES={'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': ':memory:'}},
+)
+django.setup()
+import sqlalchemy, sqlalchemy.orm, sqlalchemy.ext.declarative
+base = set(sys.modules)
+start = time.perf_counter()
+import d2a
+elapsed = time.perf_counter() - start
+print(json.dumps({'seconds': elapsed, 'modules': sorted(set(sys.modules) - base)}))
+'''
+
+GROUPS = [
+    'sqlalchemy.dialects.',
+    'django.contrib.postgres',
+    'django.contrib.gis',
+    'geoalchemy2',
+    'psycopg2',
+    'numpy',
+]
+
+
+def run_child():
+    out = subprocess.run([sys.executable, '-c', CHILD], check=True, stdout=subprocess.PIPE, universal_newlines=True)
+    return json.loads(out.stdout.splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    results = [run_child() for _ in range(args.repeat)]
+    modules = results[-1]['modules']
+    print('import d2a: best {:.1f}ms of {}, {} modules'.format(
+        min(r['seconds'] for r in results) * 1000, args.repeat, len(modules)))
+    for prefix in GROUPS:
+        print('  {:<26} {:>4}'.format(prefix, len([m for m in modules if m.startswith(prefix)])))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""Allocation and time of row representations made by `query_expression`.
+
+  $ python benchmarks/bench_rows.py --rows 100000
+
+It does not need database servers, the rows are made from tuples fetched beforehand.
+"""
+import argparse
+import gc
+import os
+import time
+import tracemalloc
+from collections import OrderedDict
+
+import django
+from django.conf import settings
+
+if not os.environ.get('DJANGO_SETTINGS_MODULE'):
+    settings.configure(DATABASES={'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': ':memory:'}})
+django.setup()
+
+import sqlalchemy as sa  # noqa: E402
+from d2a.db import Row, _row_maker  # noqa: E402
+
+
+def measure(stmt, cursor, dict_method):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    rows = list(map(_row_maker(stmt, dict_method), cursor))
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del rows
+    return elapsed, current, peak
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--columns', type=int, default=5)
+    args = parser.parse_args()
+
+    table = sa.table('sales', *[sa.column('c{}'.format(i)) for i in range(args.columns)])
+    stmt = sa.select(list(table.c))
+    cursor = [tuple(range(i, i + args.columns)) for i in range(args.rows)]
+
+    print('{:<12} {:>10} {:>14} {:>14}'.format('dict_method', 'time[s]', 'retained[KiB]', 'peak[KiB]'))
+    for name, dict_method in [('OrderedDict', OrderedDict), ('dict', dict), ('Row', Row)]:
+        elapsed, current, peak = measure(stmt, cursor, dict_method)
+        print('{:<12} {:>10.3f} {:>14.0f} {:>14.0f}'.format(name, elapsed, current / 1024, peak / 1024))
+
+
+if __name__ == '__main__':
+    main()
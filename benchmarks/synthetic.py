@@ -0,0 +1,115 @@
+# coding: utf-8
+"""Synthetic django project for benchmarks.
+
+`write_project` writes apps (``synth_0000`` ...) whose `models.py` have the field types of `d2a.fields.mapping`,
+foreign keys and one-to-one fields between the models (across apps as well),
+many-to-many fields with auto-created and explicit intermediate models, and geometry fields optionally.
+"""
+import importlib
+import os
+
+from django.db import models
+
+# field class name -> arguments in the source.
+ARGS = {
+    'CharField': 'max_length=100',
+    'CICharField': 'max_length=100',
+    'CommaSeparatedIntegerField': 'max_length=100',
+    'DecimalField': 'max_digits=10, decimal_places=2',
+    'FilePathField': "path='/tmp'",
+    'ArrayField': 'models.IntegerField()',
+}
+
+# relations are written separately, primary keys are the implicit ones.
+SKIPPED = {
+    'AutoField', 'BigAutoField', 'SmallAutoField', 'ForeignKey', 'OneToOneField', 'ManyToManyField',
+}
+
+# (alias in the source, module, import statement)
+MODULES = [
+    ('models', 'django.db.models', 'from django.db import models'),
+    ('pg', 'django.contrib.postgres.fields', 'from django.contrib.postgres import fields as pg'),
+    ('gis', 'django.contrib.gis.db.models', 'from django.contrib.gis.db import models as gis'),
+]
+
+
+def field_types(geo=False):
+    """It returns field classes of `d2a.fields.mapping` as pairs of alias of the module and the class name.
+
+    :param bool geo: Whether GeoDjango fields are included, it needs GDAL and GeoAlchemy2.
+    """
+    modules = []
+    for alias, name, _ in MODULES:
+        if alias == 'gis' and not geo:
+            continue
+        try:
+            modules.append((importlib.import_module(name), alias))
+        except ImportError:
+            # e.g. django.contrib.postgres without psycopg2
+            pass
+    from d2a.fields import mapping, load_optional_rules
+    load_optional_rules()
+
+    result = []
+    for field_type in list(mapping):
+        if not isinstance(field_type, type) or not issubclass(field_type, models.Field):
+            continue
+        name = field_type.__name__
+        if name in SKIPPED:
+            continue
+        for module, alias in modules:
+            if getattr(module, name, None) is field_type:
+                result.append((alias, name))
+                break
+    return result
+
+
+def _model_source(index, app_label, num_fields, types, label_of):
+    name = 'Model{:05d}'.format(index)
+    lines = ['class {}(models.Model):'.format(name)]
+    for i in range(num_fields):
+        alias, field = types[(index + i) % len(types)]
+        lines.append('    f{} = {}.{}({})'.format(i, alias, field, ARGS.get(field, '')))
+    if index >= 1:
+        lines.append("    parent = models.ForeignKey('{}', on_delete=models.CASCADE, null=True)".format(label_of(index - 1)))
+    if index >= 2 and index % 7 == 0:
+        lines.append("    origin = models.OneToOneField('{}', on_delete=models.CASCADE)".format(label_of(index - 2)))
+    if index >= 3 and index % 5 == 0:
+        lines.append("    tags = models.ManyToManyField('{}')".format(label_of(index - 3)))
+    if index >= 7 and index % 20 == 0:
+        lines.append("    links = models.ManyToManyField('{}', through='Link{:05d}')".format(label_of(index - 7), index))
+        lines += [
+            '',
+            '',
+            'class Link{:05d}(models.Model):'.format(index),
+            "    source = models.ForeignKey('{}.{}', on_delete=models.CASCADE)".format(app_label, name),
+            "    target = models.ForeignKey('{}', on_delete=models.CASCADE)".format(label_of(index - 7)),
+            '    created = models.DateTimeField(auto_now_add=True)',
+        ]
+    return '\n'.join(lines)
+
+
+def write_project(root, num_models, models_per_app=50, num_fields=12, geo=False):
+    """It writes apps into the directory, and returns their names.
+
+    Sizes are ``num_models`` models (except for intermediate models) of ``num_fields`` fields and relations.
+    """
+    types = field_types(geo)
+    num_apps = (num_models + models_per_app - 1) // models_per_app
+    apps = ['synth_{:04d}'.format(i) for i in range(num_apps)]
+
+    def label_of(index):
+        return '{}.Model{:05d}'.format(apps[index // models_per_app], index)
+
+    aliases = {'models'} | {alias for alias, _ in types}
+    header = ['# coding: utf-8'] + [statement for alias, _, statement in MODULES if alias in aliases]
+    for i, app in enumerate(apps):
+        path = os.path.join(root, app)
+        os.makedirs(path, exist_ok=True)
+        with open(os.path.join(path, '__init__.py'), 'w'):
+            pass
+        indexes = range(i * models_per_app, min((i + 1) * models_per_app, num_models))
+        sources = header + [''] + ['\n\n' + _model_source(j, app, num_fields, types, label_of) for j in indexes]
+        with open(os.path.join(path, 'models.py'), 'w') as f:
+            f.write('\n'.join(sources) + '\n')
+    return apps
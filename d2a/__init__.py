@@ -1,23 +1,34 @@
 # coding: utf-8
 import importlib
 import types
+from fnmatch import fnmatchcase
 import sys
+import threading
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
+from django.apps import apps as django_apps
 from django.conf import settings
 
-from sqlalchemy import Column, ForeignKey
+from sqlalchemy import Column, ForeignKey, Table
+from sqlalchemy.types import SchemaType
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, configure_mappers, RelationshipProperty
 
-from .parsers import parse_models, parse_model
+from .parsers import parse_models, parse_model, get_dependencies
+from . import profiling
 from .utils import get_camelcase
-from .fields import alias, alias_dict, JSONType
+from .compat import class_registry, remove_class
+from .fields import alias, alias_dict, load_type, load_optional_rules, JSONType
 from .db import (
-    AUTO_DETECTED_DB_TYPE,
-    query_expression, execute_expression,
-    make_engine, make_session,
+    AUTO_DETECTED_DB_TYPE, Row, QueryResult,
+    query_expression, query_many, stream_expression, execute_expression, execute_many,
+    make_engine, make_session, dispose_engines, warm_up_engines,
+    async_query_expression, async_stream_expression, async_execute_expression,
+    make_async_engine, async_make_session, async_dispose_engines,
 )
+from .loaders import copy_rows
+from .frames import read_frame, write_frame
 
 DB_TYPES = ['postgresql', 'mysql', 'oracle', 'sqlite3', 'firebird', 'mssql', 'default']
 
@@ -27,93 +38,512 @@ alias_dict(D2A_CONFIG.get('ALIASES', {}))
 
 Base = declarative_base()
 existing = {}
+_lock = threading.RLock()
+
+# django model -> result of `parse_model`, which is shared by all registries.
+_model_infos = {}
+
+
+class Registry(object):
+    """Declarative base and classes declared for a pair of db type and database alias.
+
+    :param str db_type: Database type, for example `postgresql`.
+    :param str database: Django database alias.
+    """
+
+    def __init__(self, db_type, database, base=None, existing=None):
+        self.db_type = db_type
+        self.database = database
+        self.Base = declarative_base() if base is None else base
+        self.metadata = self.Base.metadata
+        # django model -> declarative class
+        self.existing = {} if existing is None else existing
+        # django model -> Table, made by `declare_table` or with the declarative class.
+        self.tables = {}
+
+    def __repr__(self):
+        return '<Registry {}:{}>'.format(self.db_type, self.database)
+
+
+# (db_type, database) -> Registry, `Base` and `existing` belong to the default one.
+registries = OrderedDict([
+    ((AUTO_DETECTED_DB_TYPE, 'default'), Registry(AUTO_DETECTED_DB_TYPE, 'default', Base, existing)),
+])
+
+
+def get_registry(db_type=AUTO_DETECTED_DB_TYPE, database='default'):
+    """It returns the `Registry` of the db type and the database alias, it is made on first call.
+
+    Models declared for another pair are different classes in another ``MetaData``,
+    so variants for several dialects can coexist in a process.
+    """
+    key = (db_type, database)
+    registry = registries.get(key)
+    if registry is None:
+        with _lock:
+            registry = registries.get(key)
+            if registry is None:
+                registry = registries[key] = Registry(db_type, database)
+    return registry
+
+
+def _parse(django_model):
+    model_info = _model_infos.get(django_model)
+    if model_info is None:
+        model_info = _model_infos[django_model] = parse_model(django_model)
+    return model_info
 
 
 def _extract_kwargs(kwargs):
     return {k: v for k, v in kwargs.items() if not (k.startswith('__') and k.endswith('__'))}
 
 
-def declare(django_model, db_type=AUTO_DETECTED_DB_TYPE, back_type='backref'):
+# (type class, kwargs) -> type instance shared by columns.
+_type_pool = {}
+
+
+def _make_type(col_type, type_kwargs):
+    """It returns an instance of the column type, which is shared by columns having the same type and arguments.
+
+    Schema types (e.g. ``Boolean``, ``Enum``) and unhashable arguments make a new instance each time,
+    because the former are bound to a table.
+    """
+    if issubclass(col_type, SchemaType):
+        return col_type(**type_kwargs)
+    key = (col_type, tuple(sorted(type_kwargs.items())))
+    try:
+        return _type_pool[key]
+    except KeyError:
+        return _type_pool.setdefault(key, col_type(**type_kwargs))
+    except TypeError:
+        return col_type(**type_kwargs)
+
+
+def _column_spec(fields, db_type):
+    """It returns a type class, kwargs of the type and kwargs of the column, or ``None`` unless the field has a type."""
+    type_key = 'default' if fields.get('__{}_type__'.format(db_type)) is None else db_type
+    col_type = fields.get('__{}_type__'.format(type_key))
+    if not col_type:
+        return None
+    return load_type(col_type), fields.get('__{}_type_kwargs__'.format(type_key), {}), _extract_kwargs(fields)
+
+
+def _make_column(name, fields, db_type):
+    spec = _column_spec(fields, db_type)
+    if not spec:
+        return None
+    col_type, type_kwargs, col_kwargs = spec
+    col_args = [_make_type(col_type, type_kwargs)]
+    if '__fk_kwargs__' in fields:
+        col_args.append(ForeignKey(**_extract_kwargs(fields['__fk_kwargs__'])))
+    return Column(name, *col_args, **col_kwargs)
+
+
+def declare_attrs(django_model, table_name, attrs, registry=None):
+    """It makes a declarative class of the attributes for the django model, unless the model has been declared.
+
+    Generated `models_sqla` modules (``manage.py d2a_generate``) also use this function.
+
+    :param Registry registry: If omitted, the default registry (`Base` and `existing`).
+    """
+    registry = registry or get_registry()
+    with _lock:
+        if django_model in registry.existing:
+            return registry.existing[django_model]
+        cls = registry.existing[django_model] = type(table_name, (registry.Base,), attrs)
+        registry.tables[django_model] = cls.__table__
+    return cls
+
+
+def declare_table(django_model, db_type=AUTO_DETECTED_DB_TYPE, model_info=None, database='default'):
+    """It converts a django model to a sqlalchemy ``Table`` without the declarative class, for SQLAlchemy Core.
+
+    It skips relationships and mappers, so it is faster and smaller than `declare`.
+    The table is in the ``MetaData`` of the registry, and `declare` maps a class to it on first call.
+    Arguments are the same as `declare` except for `back_type`.
+    """
+    registry = get_registry(db_type, database)
+    table = registry.tables.get(django_model)
+    if table is not None:
+        return table
+    if model_info is None:
+        model_info = _parse(django_model)
+
+    with profiling.measure('declare', django_model):
+        columns = [_make_column(name, fields, db_type) for name, fields in model_info['fields'].items()]
+        with _lock:
+            table = registry.tables.get(django_model)
+            if table is None:
+                table = registry.tables[django_model] = Table(
+                    model_info['table_name'], registry.metadata, *[c for c in columns if c is not None])
+    # intermediate tables of m2m fields, as `declare` does.
+    for fields in model_info['fields'].values():
+        secondary_model = fields.get('__rel_kwargs__', {}).get('__secondary_model__')
+        if secondary_model is not None:
+            declare_table(secondary_model, db_type=db_type, database=database)
+    return table
+
+
+def declare(django_model, db_type=AUTO_DETECTED_DB_TYPE, back_type='backref', model_info=None, database='default'):
     """It converts a django model to alchemy orm object.
 
     :param django.db.models.base.Model django_model: Django model object or equivalent object.
-    :param str db_type: Database type, for example `postgresql`. If omitted this option, it will be detected from django settings.
+    :param str db_type: Database type, for example `postgresql`.
+      If omitted this option, it will be detected from django settings.
     :param str back_type: Back relation type, `backref` or ``None`` (it does not support `back_populates`).
+    :param dict model_info: Result of `parse_model` for the model.
+      If omitted, the model is parsed here (once per process).
+    :param str database: Django database alias. The class is declared once per pair with `db_type` (see `get_registry`).
 
     This function is also called from `transfer` :)
     """
 
-    model_info = parse_model(django_model)
-    if django_model in existing:
-        return existing[django_model]
-
-    rel_options = OrderedDict()
-    attrs = OrderedDict({'__tablename__': model_info['table_name']})
-    for name, fields in model_info['fields'].items():
-        rel_option = fields.get('__rel_kwargs__', {})
-        if rel_option:
-            rel_options[name] = rel_option
-
-        col_types = {}
-        col_type_options = {}
-        for _db_type in DB_TYPES:
-            col_types[_db_type] = fields.get('__{}_type__'.format(_db_type), None)
-            col_type_options[_db_type] = fields.get('__{}_type_kwargs__'.format(_db_type), {})
-
-        type_key = 'default' if col_types.get(db_type) is None else db_type
-        if col_types[type_key]:
-            col_args = [col_types[type_key](**col_type_options[type_key])]
-            if '__fk_kwargs__' in fields:
-                col_args.append(ForeignKey(**_extract_kwargs(fields['__fk_kwargs__'])))
-
-            column = attrs[name] = Column(*col_args, **_extract_kwargs(fields))
-            rel_option['foreign_keys'] = [column]
-
-    for logical_name, rel_option in rel_options.items():
-        if '__secondary_model__' in rel_option:
-            secondary = rel_option['secondary'] = declare(rel_option['__secondary_model__'], db_type=db_type, back_type=back_type).__table__
-            target_field = rel_option['__target_field__']
-            rel_option['primaryjoin'] = attrs[target_field] == secondary.c[rel_option['__remote_primary_field__']]
-            rel_option['secondaryjoin'] = attrs[target_field] == secondary.c[rel_option['__remote_secondary_field__']]
+    registry = get_registry(db_type, database)
+    if django_model in registry.existing:
+        return registry.existing[django_model]
+    if model_info is None:
+        model_info = _parse(django_model)
+
+    # the table made by `declare_table` is mapped as is.
+    table = registry.tables.get(django_model)
+    with profiling.measure('declare', django_model):
+        rel_options = OrderedDict()
+        if table is None:
+            attrs = OrderedDict({'__tablename__': model_info['table_name']})
+        else:
+            attrs = OrderedDict({'__table__': table})
+        for name, fields in model_info['fields'].items():
+            # copied, the parsed info is shared by registries.
+            rel_option = dict(fields.get('__rel_kwargs__', {}))
+            if rel_option:
+                rel_options[name] = rel_option
+
+            if table is None:
+                column = _make_column(name, fields, db_type)
+            else:
+                column = table.c.get(name)
+            if column is not None:
+                attrs[name] = column
+                rel_option['foreign_keys'] = [column]
+
+        for logical_name, rel_option in rel_options.items():
+            if '__secondary_model__' in rel_option:
+                secondary = rel_option['secondary'] = declare(
+                    rel_option['__secondary_model__'], db_type=db_type, back_type=back_type, database=database,
+                ).__table__
+                target_field = rel_option['__target_field__']
+                rel_option['primaryjoin'] = (
+                    attrs[target_field] == secondary.c[rel_option['__remote_primary_field__']])
+                rel_option['secondaryjoin'] = (
+                    attrs[target_field] == secondary.c[rel_option['__remote_secondary_field__']])
         
-        if '__logical_name__' in rel_option:
-            logical_name = rel_option['__logical_name__']
+            if '__logical_name__' in rel_option:
+                logical_name = rel_option['__logical_name__']
 
-        back = rel_option.get('__back__', None)
-        if back and back_type:
-            rel_option[back_type] = back.rstrip('+')
+            back = rel_option.get('__back__', None)
+            if back and back_type:
+                rel_option[back_type] = back.rstrip('+')
 
-        attrs[logical_name] = relationship(rel_option['__target__'], **_extract_kwargs(rel_option))
+            attrs[logical_name] = relationship(rel_option['__target__'], **_extract_kwargs(rel_option))
 
-    cls = existing[django_model] = type(model_info['table_name'], (Base,), attrs)
-    return cls
+        return declare_attrs(django_model, model_info['table_name'], attrs, registry)
 
 
-def transfer(models, exports, db_type=AUTO_DETECTED_DB_TYPE, back_type='backref', as_table=False, name_formatter=get_camelcase):
+def transfer(models, exports, db_type=AUTO_DETECTED_DB_TYPE, back_type='backref', as_table=False,
+             name_formatter=get_camelcase, database='default'):
     """It makes sqlalchemy model objects from django models.
 
     :param module models: Django `models.py` or equivalent object.
     :param dict exports: Namespace which you want to put the models into. In most case, that is ``globals()``.
-    :param str db_type: Database type, for example `postgresql`. If omitted this option, it will be detected from django settings.
+    :param str db_type: Database type, for example `postgresql`.
+      If omitted this option, it will be detected from django settings.
     :param str back_type: Back relation type, `backref` or ``None`` (it does not support `back_populates`).
-    :param bool as_table: Whether outputting as `SQL Expression` schema (``orm.__table__``) or not.
+    :param bool as_table: Whether outputting as `SQL Expression` schema (``Table``) or not.
+      The tables are made by `declare_table`, so the orm classes are not declared until `declare` is called.
     :param function name_formatter: It receives an argument (model name) as ``str``, and returns formetted model name.
+    :param str database: Django database alias, see `declare`.
     """
 
     for model in parse_models(models).values():
-        declare(model, db_type=db_type, back_type=back_type)
+        if as_table:
+            declare_table(model, db_type=db_type, database=database)
+        else:
+            declare(model, db_type=db_type, back_type=back_type, database=database)
+    _export(models, exports, as_table, name_formatter, get_registry(db_type, database))
+
 
-    for django_model, alchemy_model in existing.items():
+def _export(models, exports, as_table, name_formatter, registry):
+    for django_model, value in list((registry.tables if as_table else registry.existing).items()):
         if models.__name__ == django_model.__module__:
-            key = name_formatter(django_model._meta.object_name)
-            exports[key] = alchemy_model.__table__ if as_table else alchemy_model
+            exports[name_formatter(django_model._meta.object_name)] = value
+
+
+def transfer_all(modules, db_type=AUTO_DETECTED_DB_TYPE, back_type='backref', as_table=False,
+                 name_formatter=get_camelcase, workers=None, database='default', selected=None):
+    """It does `transfer` for several apps at once, `autoload` calls this.
+
+    Models are parsed concurrently by a thread pool, then declared in a single pass
+    where the models which they refer to come first.
+
+    :param modules: Pairs of django `models.py` (or equivalent object) and namespace to put the models into.
+    :param int workers: Max num of threads parsing models. If omitted, the default of ``ThreadPoolExecutor``.
+    :param selected: Django models to convert (e.g. the result of `select_models`), the others are skipped.
+      If omitted, all models of the modules.
+    Other arguments are the same as `transfer`.
+    """
+    modules = list(modules)
+    models = _with_dependencies(
+        model for django_models, _ in modules for model in parse_models(django_models).values()
+        if selected is None or model in selected
+    )
+    registry = get_registry(db_type, database)
+    pending = [model for model in models if model not in registry.existing and model not in _model_infos]
+    if profiling.current is not None:
+        # allocations are not attributed to models correctly in parallel.
+        workers = 1
+    # rules of fields are complete before parsing in parallel.
+    load_optional_rules()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        _model_infos.update(zip(pending, executor.map(parse_model, pending)))
+
+    with _lock:
+        for model in models:
+            if as_table:
+                declare_table(model, db_type=db_type, database=database)
+            else:
+                declare(model, db_type=db_type, back_type=back_type, database=database)
+    for django_models, exports in modules:
+        _export(django_models, exports, as_table, name_formatter, registry)
+
+
+def _with_dependencies(models):
+    """It returns the models and all models which they refer to recursively, without duplication.
+
+    Referred models come before the models referring to them, except for circular references.
+    """
+    result = OrderedDict()
+    visited = set()
+    stack = [(model, False) for model in reversed(list(models))]
+    while stack:
+        model, done = stack.pop()
+        if done:
+            result[model] = None
+            continue
+        if model in visited:
+            continue
+        visited.add(model)
+        stack.append((model, True))
+        stack.extend((m, False) for m in reversed(get_dependencies(model)))
+    return list(result)
+
+
+def _match(model, patterns):
+    labels = (model._meta.app_label.lower(), model._meta.label_lower)
+    return any(fnmatchcase(label, pattern.lower()) for pattern in patterns for label in labels)
+
+
+def select_models(models, include=None, exclude=None):
+    """It returns the models matching `include` and not matching `exclude`, with all models which they refer to.
+
+    Patterns are app labels or model labels (``app_label.ModelName``), case-insensitive,
+    and may have shell-style wildcards, e.g. ``'auth'``, ``'sales.*'`` or ``'books.Book*'``.
+    The models referred to by foreign keys and many-to-many fields are included even if they are excluded,
+    since the relationships can't be declared without them.
+
+    :param list include: Patterns of models to convert. If omitted, all models.
+    :param list exclude: Patterns of models not to convert.
+    """
+    return _with_dependencies(
+        model for model in models
+        if (not include or _match(model, include)) and not (exclude and _match(model, exclude))
+    )
+
+
+class LazyModule(types.ModuleType):
+    """Module whose sqlalchemy models are declared on first access, `autoload` makes it in lazy mode.
+
+    A model is declared with the models which it refers to, the others are never parsed.
+    Arguments are the same as `transfer_all` except for `modules` and `workers`.
+    """
+
+    def __init__(self, name, models, db_type=AUTO_DETECTED_DB_TYPE, back_type='backref',
+                 as_table=False, name_formatter=get_camelcase, database='default', selected=None):
+        super(LazyModule, self).__init__(name)
+        # auto-created intermediate models of m2m fields as well, as `transfer` does.
+        candidates = OrderedDict.fromkeys(
+            m for model in parse_models(models).values()
+            for m in [model] + [f.remote_field.through for f in model._meta.many_to_many]
+        )
+        self._d2a_models = OrderedDict(
+            (name_formatter(model._meta.object_name), model)
+            for model in candidates
+            if models.__name__ == model.__module__ and (selected is None or model in selected)
+        )
+        self._d2a_options = {'db_type': db_type, 'back_type': back_type, 'database': database}
+        self._d2a_as_table = as_table
+        self.__all__ = list(self._d2a_models)
+
+    def __getattr__(self, name):
+        model = self.__dict__.get('_d2a_models', {}).get(name)
+        if model is None:
+            raise AttributeError("module '{}' has no attribute '{}'".format(self.__name__, name))
+
+        registry = get_registry(self._d2a_options['db_type'], self._d2a_options['database'])
+        with _lock:
+            for m in _with_dependencies([model]):
+                if self._d2a_as_table:
+                    declare_table(m, db_type=registry.db_type, database=registry.database)
+                else:
+                    declare(m, **self._d2a_options)
+        value = (registry.tables if self._d2a_as_table else registry.existing)[model]
+        setattr(self, name, value)
+        return value
+
+    def __dir__(self):
+        return sorted(set(self.__dict__) | set(self._d2a_models))
+
+
+def _current_model(django_model):
+    meta = django_model._meta
+    return django_apps.all_models.get(meta.app_label, {}).get(meta.model_name, django_model)
+
+
+def _remove_relationships(cls, targets):
+    mapper = cls.__mapper__
+    if not mapper.configured:
+        # relationships are not resolved yet, and no backrefs have been added.
+        return
+    for key, prop in list(mapper._props.items()):
+        if isinstance(prop, RelationshipProperty) and prop.mapper.class_ in targets:
+            del mapper._props[key]
+            # declarative classes refuse to delete mapped attributes, so it becomes a plain value first.
+            type.__setattr__(cls, key, None)
+            mapper.class_manager.uninstrument_attribute(key)
+    mapper._expire_memoizations()
+
+
+def redeclare(models=None, db_type=AUTO_DETECTED_DB_TYPE, back_type='backref', database='default', exports=None):
+    """It declares the changed django models again with the models referring to them, the others are kept as is.
+
+    It is for development, e.g. notebooks or shells where ``importlib.reload`` is applied to `models.py`.
+    A model is changed when the app registry has another class of the model (reloaded),
+    or the result of `parse_model` differs from the one declared.
+    Their classes and tables are removed from the registry and its ``MetaData``,
+    relationships added to the kept classes by them (backrefs) are removed, then they are declared again.
+
+    The modules made by `autoload` (and `exports`) get the new classes (or tables) in place of the old ones.
+
+    :param models: Django models to check. If omitted, all models declared in the registry.
+    :param dict exports: Namespace to update in addition, for example ``globals()`` of a notebook.
+    Other arguments are the same as `transfer`.
+    :return: OrderedDict of django model -> new declarative class (or ``Table`` made by `declare_table`).
+    """
+    registry = get_registry(db_type, database)
+    with _lock:
+        declared = list(OrderedDict.fromkeys(list(registry.existing) + list(registry.tables)))
+        if models is None:
+            candidates = declared
+        else:
+            labels = {m._meta.label_lower for m in models}
+            candidates = [m for m in declared if m._meta.label_lower in labels]
+
+        # old django model -> current django model
+        affected = OrderedDict()
+        for model in candidates:
+            current = _current_model(model)
+            if current is not model:
+                affected[model] = current
+            elif model in _model_infos:
+                info = parse_model(model)
+                if info != _model_infos[model]:
+                    _model_infos[model] = info
+                    affected[model] = model
+        labels = {m._meta.label_lower for m in affected}
+        while True:
+            referrers = [
+                m for m in declared
+                if m not in affected and any(d._meta.label_lower in labels for d in get_dependencies(m))
+            ]
+            if not referrers:
+                break
+            for m in referrers:
+                affected[m] = _current_model(m)
+                labels.add(m._meta.label_lower)
+        if not affected:
+            return OrderedDict()
+
+        # the old mappers are kept by sqlalchemy until they are collected,
+        # and configuring them later fails once the classes they refer to are removed.
+        configure_mappers()
+        old_classes = {model: registry.existing[model] for model in affected if model in registry.existing}
+        old_tables = {model: registry.tables[model] for model in affected if model in registry.tables}
+        targets = set(old_classes.values())
+        for model, cls in list(registry.existing.items()):
+            if model not in affected:
+                _remove_relationships(cls, targets)
+        decl_class_registry = class_registry(registry.Base)
+        for model in affected:
+            cls = registry.existing.pop(model, None)
+            if cls is not None:
+                remove_class(cls.__name__, cls, decl_class_registry)
+            table = registry.tables.pop(model, None)
+            if table is not None and table.key in registry.metadata.tables:
+                registry.metadata.remove(table)
+            if affected[model] is not model:
+                _model_infos.pop(model, None)
+
+        as_table = not old_classes
+        for model in _with_dependencies(affected.values()):
+            old = next((k for k, v in affected.items() if v is model), None)
+            kept = model in registry.existing or model in registry.tables
+            if old is None and (kept or _current_model(model) is not model):
+                # kept as is, or an old class still referred to by the other models.
+                continue
+            if old in old_classes or (old is None and not as_table):
+                declare(model, db_type=db_type, back_type=back_type, database=database)
+            else:
+                declare_table(model, db_type=db_type, database=database)
+
+        result = OrderedDict()
+        replacements = {}
+        for model, current in affected.items():
+            if model in old_classes:
+                replacements[id(old_classes[model])] = result[current] = registry.existing[current]
+            if model in old_tables:
+                replacements[id(old_tables[model])] = registry.tables[current]
+                result.setdefault(current, registry.tables[current])
+        module = D2A_CONFIG.get('AUTOLOAD', {}).get('module', 'models_sqla')
+        namespaces = [exports] if exports is not None else []
+        for name in OrderedDict.fromkeys(m.__module__ for m in affected):
+            package, _, models_module = name.rpartition('.')
+            namespace = sys.modules.get('{}.{}'.format(package, module)) if models_module == 'models' else None
+            if namespace is not None:
+                if isinstance(namespace, LazyModule):
+                    namespace._d2a_models.update(
+                        (key, affected.get(m, m)) for key, m in list(namespace._d2a_models.items()))
+                namespaces.append(vars(namespace))
+        for namespace in namespaces:
+            for key, value in list(namespace.items()):
+                if id(value) in replacements:
+                    namespace[key] = replacements[id(value)]
+    return result
 
 
 def autoload(config=D2A_CONFIG.get('AUTOLOAD', {})):
     """It loads all models automatically.
+
+    If ``config['lazy']`` is True, the modules become `LazyModule` unless they exist.
+    If ``config['include']`` or ``config['exclude']`` is set, only the models selected by `select_models` are converted.
+    If ``D2A_CONFIG['PROFILE']`` is set, it profiles the conversion and reports it (see `d2a.profiling`).
     """
+    profile = D2A_CONFIG.get('PROFILE')
+    if profile:
+        profiling.start()
     module = config.get('module', 'models_sqla')
     option = config.get('option', {})
+    lazy = config.get('lazy', False)
+    # pairs of django models module and the module name to make.
+    targets = []
     for app in settings.INSTALLED_APPS:
         mods = app.split('.')
         for i in range(1, len(mods) + 1):
@@ -122,11 +552,41 @@ def autoload(config=D2A_CONFIG.get('AUTOLOAD', {})):
             a = '{mod}.{module}'.format(mod=mod, module=module)
             if importlib.util.find_spec(d) is None:
                 continue
+            if lazy:
+                if a not in sys.modules and importlib.util.find_spec(a) is None:
+                    targets.append((importlib.import_module(d), a))
+                continue
             try:
                 importlib.import_module(a)
             except ImportError:
-                sys.modules[a] = types.ModuleType(a)
-                transfer(importlib.import_module(d), sys.modules[a].__dict__, **option)
+                targets.append((importlib.import_module(d), a))
+
+    selected = None
+    if config.get('include') or config.get('exclude'):
+        selected = set(select_models(
+            [model for models, _ in targets for model in parse_models(models).values()],
+            config.get('include'), config.get('exclude'),
+        ))
+    modules = []
+    for models, a in targets:
+        if lazy:
+            sys.modules[a] = LazyModule(a, models, selected=selected, **option)
+        else:
+            sys.modules[a] = types.ModuleType(a)
+            modules.append((models, sys.modules[a].__dict__))
+    if modules:
+        transfer_all(modules, workers=config.get('workers'), selected=selected, **option)
+    if profile:
+        _report_profile(profile)
+
+
+def _report_profile(profile):
+    configure_mappers()
+    profiler = profiling.stop()
+    if isinstance(profile, str):
+        profiler.dump(profile)
+    else:
+        sys.stderr.write(profiler.format())
 
 
 default_app_config = "d2a.apps.D2aConfig"
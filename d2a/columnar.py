@@ -0,0 +1,117 @@
+# coding: utf-8
+import datetime
+from collections import OrderedDict
+
+from sqlalchemy.sql import sqltypes
+
+"""
+Columnar results
+
+  - https://numpy.org/doc/stable/reference/arrays.dtypes.html
+  - https://numpy.org/doc/stable/reference/maskedarray.html
+
+"""
+
+# sqlalchemy type class -> numpy dtype, the others become `object`.
+DTYPES = {
+    sqltypes.Integer: 'int64',
+    sqltypes.Float: 'float64',
+    sqltypes.Boolean: 'bool',
+    sqltypes.DateTime: 'datetime64[us]',
+    sqltypes.Date: 'datetime64[D]',
+    sqltypes._AbstractInterval: 'timedelta64[us]',
+}
+
+# numpy dtype kind -> value filled in masked (NULL) elements.
+FILL_VALUES = {
+    'i': 0,
+    'f': float('nan'),
+    'b': False,
+    'M': 'NaT',
+    'm': 'NaT',
+}
+
+
+def _import_numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError('Columnar results require "numpy". Do as follows: "pip install numpy".')
+    return numpy
+
+
+def get_dtype(sa_type):
+    """It returns numpy dtype name of the column type.
+
+    :param sqlalchemy.types.TypeEngine sa_type: Column type (instance or class).
+    """
+    sa_type = sa_type if isinstance(sa_type, type) else type(sa_type)
+    for cls in sa_type.__mro__:
+        if cls in DTYPES:
+            return DTYPES[cls]
+    return 'object'
+
+
+def _to_naive_utc(value):
+    if isinstance(value, datetime.datetime) and value.tzinfo is not None:
+        return value.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _grow(allocate, arrays, size, capacity):
+    grown = []
+    for array in arrays:
+        new = allocate(capacity, array.dtype)
+        new[:size] = array[:size]
+        grown.append(new)
+    return grown
+
+
+def fetch_columns(cursor, columns, chunk_size=1000):
+    """It fetches rows from the cursor in chunks, and returns an OrderedDict of numpy array per column.
+
+    Nullable columns become masked arrays unless their dtype is `object`, which keeps ``None``.
+
+    :param cursor: DB-API cursor which has executed a query.
+    :param columns: Columns of the query, for example ``stmt.c``.
+    :param int chunk_size: number of rows fetched at once.
+    """
+    np = _import_numpy()
+    columns = list(columns)
+    dtypes = [np.dtype(get_dtype(c.type)) for c in columns]
+    capacity = chunk_size
+    arrays = [np.empty(capacity, dtype) for dtype in dtypes]
+    masks = [np.zeros(capacity, bool) for _ in dtypes]
+    size = 0
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            break
+        end = size + len(rows)
+        if end > capacity:
+            capacity = max(end, capacity * 2)
+            arrays = _grow(np.empty, arrays, size, capacity)
+            masks = _grow(np.zeros, masks, size, capacity)
+
+        for array, mask, dtype, values in zip(arrays, masks, dtypes, zip(*rows)):
+            if dtype.kind == 'O':
+                # element-wise, sequences (e.g. ARRAY) must not be broadcasted.
+                for i, value in enumerate(values, size):
+                    array[i] = value
+                continue
+            if dtype.kind == 'M':
+                values = [_to_naive_utc(v) for v in values]
+            if any(v is None for v in values):
+                mask[size:end] = [v is None for v in values]
+                fill_value = FILL_VALUES[dtype.kind]
+                values = [fill_value if v is None else v for v in values]
+            array[size:end] = values
+        size = end
+
+    result = OrderedDict()
+    for column, array, mask, dtype in zip(columns, arrays, masks, dtypes):
+        array = array[:size].copy() if size != capacity else array
+        if dtype.kind != 'O' and (getattr(column, 'nullable', True) or mask[:size].any()):
+            array = np.ma.MaskedArray(array, mask=mask[:size].copy())
+        result[column.name] = array
+    return result
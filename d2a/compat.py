@@ -7,3 +7,45 @@ try:
     basestring = basestring
 except NameError:
     basestring = (str,)
+
+
+def class_registry(base):
+    """It returns the registry of class names of the declarative base (``_decl_class_registry`` before 1.4)."""
+    registry = getattr(base, '_decl_class_registry', None)
+    if registry is None:
+        registry = base.registry._class_registry
+    return registry
+
+
+def _remove_from_marker(marker, cls):
+    for ref in list(marker.contents):
+        if ref() is cls:
+            marker._remove_item(ref)
+
+
+def remove_class(classname, cls, decl_class_registry):
+    """It removes the class from the class registry, ``sqlalchemy.orm.clsregistry.remove_class`` of 1.4 or later."""
+    existing = decl_class_registry.get(classname)
+    if existing is cls:
+        del decl_class_registry[classname]
+    elif existing is not None:
+        _remove_from_marker(existing, cls)
+
+    root_module = decl_class_registry.get('_sa_module_registry')
+    if root_module is None:
+        return
+    tokens = cls.__module__.split('.')
+    while tokens:
+        token = tokens.pop(0)
+        module = root_module.get_module(token)
+        for token in tokens:
+            module = module.get_module(token)
+        if classname in module.contents:
+            _remove_from_marker(module.contents[classname], cls)
+
+
+try:
+    # 1.4 or later
+    from sqlalchemy.orm.clsregistry import remove_class  # noqa: F401,F811
+except ImportError:
+    pass
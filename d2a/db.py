@@ -1,63 +1,141 @@
 # coding: utf-8
+import importlib
+import os
 import re
+import asyncio
 import logging
+import threading
+import time
 import warnings
-from collections import OrderedDict
+from collections import OrderedDict, namedtuple
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
+from functools import lru_cache, partial
+from itertools import chain, islice
 
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy import dialects, create_engine
+from sqlalchemy import create_engine
+from sqlalchemy.sql.dml import Insert
 from django.conf import settings
-from django.db import transaction
+from django.db import connections, transaction
 
 from .compat import basestring
+from .columnar import fetch_columns
+
+try:
+    # django 3.0 or later
+    from asgiref.sync import sync_to_async
+except ImportError:
+    sync_to_async = None
+
+
+class _Dialects(Mapping):
+    """Dialect classes of sqlalchemy by name, each dialect module is imported on first access.
+
+    `sqlite3` (django's name) is also accepted as `sqlite`.
+    """
+    NAMES = ('postgresql', 'mysql', 'oracle', 'mssql', 'sqlite', 'firebird')
+    ALIASES = {'sqlite3': 'sqlite'}
+
+    def __init__(self):
+        self._loaded = {}
+
+    def __getitem__(self, name):
+        name = self.ALIASES.get(name, name)
+        dialect = self._loaded.get(name)
+        if dialect is None:
+            if name not in self.NAMES:
+                raise KeyError(name)
+            try:
+                module = importlib.import_module('sqlalchemy.dialects.{}'.format(name))
+            except ImportError:
+                raise KeyError(name)
+            dialect = self._loaded.setdefault(name, module.dialect)
+        return dialect
+
+    def __contains__(self, name):
+        return self.ALIASES.get(name, name) in self.NAMES
+
+    def __iter__(self):
+        return iter(self.NAMES)
+
+    def __len__(self):
+        return len(self.NAMES)
 
-DIALECTS = {
-    t: getattr(dialects, t).dialect
-    for t in ['postgresql', 'mysql', 'oracle', 'mssql', 'sqlite', 'firebase']
-    if hasattr(dialects, t)
-}
+
+DIALECTS = _Dialects()
 
 EXPLAIN_PREFIXES = {
     'postgresql': 'EXPLAIN ANALYZE',
     'mysql': 'EXPLAIN',
     'oracle': 'EXPLAIN PLAN FOR',
     'sqlite': 'EXPLAIN QUERY PLAN',
+    'sqlite3': 'EXPLAIN QUERY PLAN',
 }
 
-DIALECT_MAPPING = {}
-
-key = 'postgresql'
-if key in DIALECTS:
+# dialect name -> function(sql, binded) returning driver sql and a function extracting driver params from bound values.
+SQL_CONVERTERS = {
     # https://github.com/sqlalchemy/sqlalchemy/blob/f572cdf7850b7a2ee6b7535b8129a76fa73496e6/test/sql/test_compiler.py#L2562
-    DIALECT_MAPPING[DIALECTS[key]] = lambda sql, binded: (
+    'postgresql': lambda sql, binded: (
         sql,
-        binded.params,
-    )
-
-key = 'mysql'
-if key in DIALECTS:
+        lambda params: params,
+    ),
     # https://github.com/sqlalchemy/sqlalchemy/blob/f572cdf7850b7a2ee6b7535b8129a76fa73496e6/test/sql/test_compiler.py#L2583
-    DIALECT_MAPPING[DIALECTS[key]] = lambda sql, binded: (
+    'mysql': lambda sql, binded: (
         sql,
-        tuple(binded.params[k] for k in binded.positiontup),
-    )
-
-key = 'oracle'
-if key in DIALECTS:
+        lambda params, positiontup=tuple(binded.positiontup): tuple(params[k] for k in positiontup),
+    ),
     # https://github.com/sqlalchemy/sqlalchemy/blob/f572cdf7850b7a2ee6b7535b8129a76fa73496e6/test/sql/test_compiler.py#L2569
-    DIALECT_MAPPING[DIALECTS[key]] = lambda sql, binded: (
+    'oracle': lambda sql, binded: (
         re.sub(r"(?<!:):([A-Za-z][0-9A-Za-z_]+)", r"%(\1)s", sql),
-        binded.params,
-    )
-
-key = 'sqlite'
-if key in DIALECTS:
+        lambda params: params,
+    ),
     # https://github.com/sqlalchemy/sqlalchemy/blob/f572cdf7850b7a2ee6b7535b8129a76fa73496e6/test/sql/test_compiler.py#L2599
-    DIALECT_MAPPING[DIALECTS[key]] = lambda sql, binded: (
+    'sqlite': lambda sql, binded: (
         sql.replace('?', '%s'),
-        tuple(binded.params.values()),
-    )
+        lambda params: tuple(params.values()),
+    ),
+}
+
+# dialect class -> function of `SQL_CONVERTERS`, it is filled on first use of the dialect.
+# functions returning driver sql and params (the former contract) are still accepted, see `_legacy_converter`.
+DIALECT_MAPPING = {}
+
+
+class _Rebound(object):
+    """The compiled statement whose ``params`` are replaced by the bound values of an execution."""
+
+    def __init__(self, binded, params):
+        self._binded = binded
+        self.params = params
+
+    def __getattr__(self, name):
+        return getattr(self._binded, name)
+
+
+def _legacy_converter(converter):
+    """It adapts a function returning driver sql and params to return the extractor of params instead."""
+    def convert(sql, binded):
+        converted, params = converter(sql, binded)
+        if callable(params):
+            return converted, params
+        warnings.warn(
+            'Converters of DIALECT_MAPPING should return a function extracting driver params, not the params.',
+            DeprecationWarning,
+        )
+        return converted, lambda values: converter(sql, _Rebound(binded, values))[1]
+    return convert
+
+
+def _sql_converter(dialect):
+    converter = DIALECT_MAPPING.get(dialect)
+    if converter is None:
+        converter = DIALECT_MAPPING.setdefault(dialect, SQL_CONVERTERS[dialect.name])
+    if converter is not SQL_CONVERTERS.get(dialect.name):
+        converter = _legacy_converter(converter)
+    return converter
+
 
 MS_DSN = 'DRIVER={{SQL Server}}; SERVER={HOST}; DATABASE={NAME}; UID={USER}; PWD={PASSWORD};'
 URI = {
@@ -75,9 +153,82 @@ URI = {
     'sqlite3': 'sqlite:///{NAME}',
     'sqlite+memory': 'sqlite://',
 }
+ASYNC_URI = {
+    'postgresql': 'postgresql+asyncpg://{USER}:{PASSWORD}@{HOST}:{PORT}/{NAME}',
+    'postgresql+asyncpg': 'postgresql+asyncpg://{USER}:{PASSWORD}@{HOST}:{PORT}/{NAME}',
+    'mysql': 'mysql+aiomysql://{USER}:{PASSWORD}@{HOST}:{PORT}/{NAME}',
+    'mysql+aiomysql': 'mysql+aiomysql://{USER}:{PASSWORD}@{HOST}:{PORT}/{NAME}',
+    'sqlite': 'sqlite+aiosqlite:///{NAME}',
+    'sqlite3': 'sqlite+aiosqlite:///{NAME}',
+    'sqlite+aiosqlite': 'sqlite+aiosqlite:///{NAME}',
+}
 
 logger = logging.getLogger(__name__)
 
+D2A_CONFIG = getattr(settings, 'D2A_CONFIG', {})
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'evictions', 'maxsize', 'currsize'])
+QueryResult = namedtuple('QueryResult', ['result', 'error', 'elapsed'])
+
+
+class CompiledCache(object):
+    """LRU cache of compiled statements.
+
+    An entry holds the driver sql and a function returning driver params for the bound values,
+    so that a hit skips compiling and rewriting the statement.
+    """
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.hits = self.misses = self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, entry):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def info(self):
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.evictions, self.maxsize, len(self._entries))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+
+compiled_cache = CompiledCache(D2A_CONFIG.get('COMPILED_CACHE_SIZE', 128))
+_dialect_instances = {}
+
+# (db_type, database, options) -> engine, (engine, options) -> sessionmaker
+_engines = {}
+_async_engines = {}
+_sessionmakers = {}
+_registry_lock = threading.Lock()
+# pools inherited from the parent process, they are kept to avoid closing the shared sockets.
+_inherited_pools = []
+# the thread running django connections for coroutines, unless asgiref is available.
+_sync_executor = None
+# max_workers -> executor of `query_many`, the threads keep their django connections.
+_query_executors = {}
+
 
 def _detect_db_type(database='default'):
     return {
@@ -90,11 +241,13 @@ def _detect_db_type(database='default'):
     }.get(settings.DATABASES[database]['ENGINE'])
 
 
-def _execute_cursor(cursor, sql, params):
+def _execute_cursor(cursor, sql, params, raise_error=False):
     try:
         cursor.execute(sql, params)
     except Exception:
         logger.exception('param:%s\nsql:%s', params, sql)
+        if raise_error:
+            raise
 
 
 def _complement(conn, dialect, database='default'):
@@ -108,14 +261,127 @@ def _complement(conn, dialect, database='default'):
     return conn, dialect
 
 
+class Row(tuple):
+    """Lightweight row, a tuple which also supports dict-style access by column name.
+
+    Give it as ``dict_method``, then a subclass sharing column names is made once per columns.
+    """
+
+    __slots__ = ()
+    _fields = ()
+    _index = {}
+
+    def __getitem__(self, key):
+        if isinstance(key, basestring):
+            key = self._index[key]
+        return tuple.__getitem__(self, key)
+
+    def __getattr__(self, name):
+        try:
+            return tuple.__getitem__(self, self._index[name])
+        except KeyError:
+            raise AttributeError(name)
+
+    def __eq__(self, other):
+        if isinstance(other, Mapping):
+            return dict(zip(self._fields, self)) == dict(other)
+        return tuple.__eq__(self, other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = tuple.__hash__
+
+    def __repr__(self):
+        return 'Row({})'.format(', '.join('{}={!r}'.format(k, v) for k, v in zip(self._fields, self)))
+
+    def __reduce__(self):
+        return _make_row, (self._fields, tuple(self))
+
+    def keys(self):
+        return list(self._fields)
+
+    def values(self):
+        return list(self)
+
+    def items(self):
+        return list(zip(self._fields, self))
+
+    def get(self, key, default=None):
+        index = self._index.get(key)
+        return default if index is None else tuple.__getitem__(self, index)
+
+    def _asdict(self):
+        return OrderedDict(zip(self._fields, self))
+
+
+@lru_cache(maxsize=256)
+def _row_class(fields):
+    index = {k: i for i, k in enumerate(fields)}
+    return type('Row', (Row,), {'__slots__': (), '_fields': fields, '_index': index})
+
+
+def _make_row(fields, values):
+    return _row_class(fields)(values)
+
+
+def _row_maker(stmt, dict_method):
+    names = tuple(c.name for c in stmt.c)
+    if dict_method is Row:
+        return _row_class(names)
+    return lambda row: dict_method(zip(names, row))
+
+
+def _get_dialect(dialect):
+    instance = _dialect_instances.get(dialect)
+    if instance is None:
+        instance = _dialect_instances.setdefault(dialect, dialect())
+    return instance
+
+
+def _compile(stmt, dialect):
+    """It returns driver sql and params of the statement, reusing the compiled one if cached.
+
+    The statement is keyed on its structural cache key (SQLAlchemy 1.4 or later).
+    Before 1.4 it is compiled every time, since statements can be changed in place (e.g. ``append_whereclause``).
+    """
+    reset_memoizations = getattr(stmt, '_reset_memoizations', None)
+    if reset_memoizations is not None:
+        # the cache key is memoized on the statement, which may have been changed in place since.
+        reset_memoizations()
+    generate_cache_key = getattr(stmt, '_generate_cache_key', None)
+    cache_key = generate_cache_key() if generate_cache_key else None
+    if cache_key is None:
+        # uncacheable statement, or SQLAlchemy 1.3
+        binded = stmt.compile(dialect=_get_dialect(dialect))
+        sql, extract = _sql_converter(dialect)(str(binded), binded)
+        return sql, extract(binded.params)
+
+    key = (dialect, cache_key.key)
+    entry = compiled_cache.get(key)
+    if entry is None:
+        binded = stmt.compile(dialect=_get_dialect(dialect), cache_key=cache_key)
+        sql, extract = _sql_converter(dialect)(str(binded), binded)
+        # params are made on every call, they have the values of this statement and callable bindparams.
+        entry = (sql, lambda cache_key: extract(
+            binded.construct_params(extracted_parameters=cache_key.bindparams)))
+        compiled_cache.set(key, entry)
+
+    sql, bind = entry
+    return sql, bind(cache_key)
+
+
 def query_expression(stmt, conn=None, dialect=None, database='default',
-                     as_col_dict=True, as_row_list=True, dict_method=OrderedDict, debug={}):
+                     as_col_dict=True, as_row_list=True, dict_method=OrderedDict, debug={},
+                     as_columns=False, chunk_size=1000, raise_error=False):
     """
     :stmt: sqlalchemy expression object
     :as_col_dict:
       default: True,
     :as_row_list:
       default: True,
+    :dict_method: A method making row to dict, `Row` makes lightweight rows.
+      default: OrderedDict,
     :debug:
       default: {
         'show_sql': True, # if showing the sql query or not.
@@ -129,17 +395,23 @@ def query_expression(stmt, conn=None, dialect=None, database='default',
         'delimiter': '=' * 100, # characters dividing debug informations.
         'database': 'default' # django database
       }
+    :as_columns: if returning an OrderedDict of numpy array per column instead of rows or not (requires numpy).
+      default: False,
+    :chunk_size: number of rows converted to arrays at once, when `as_columns` is True.
+      default: 1000,
+    :raise_error: if raising an error of the query or not, otherwise the error is only logged.
+      default: False,
     """
     conn, dialect = _complement(conn, dialect, database)
-    binded = stmt.compile(dialect=dialect())
-    sql, params = DIALECT_MAPPING[dialect](str(binded), binded)
+    sql, params = _compile(stmt, dialect)
     with conn.cursor() as cursor:
-        _execute_cursor(cursor, sql, params)
-        if not as_col_dict:
+        _execute_cursor(cursor, sql, params, raise_error)
+        if as_columns:
+            result = fetch_columns(cursor, stmt.c, chunk_size)
+        elif not as_col_dict:
             result = list(cursor) if as_row_list else cursor
         else:
-            dicts = (dict_method(zip([c.name for c in stmt.c], row))
-                     for row in cursor)
+            dicts = map(_row_maker(stmt, dict_method), cursor)
             result = list(dicts) if as_row_list else dicts
 
         if debug:
@@ -147,10 +419,102 @@ def query_expression(stmt, conn=None, dialect=None, database='default',
         return result
 
 
+def _server_side_cursor(conn):
+    if conn.vendor == 'mysql':
+        from MySQLdb.cursors import SSCursor
+        from django.db.backends.mysql.base import CursorWrapper
+        conn.ensure_connection()
+        return conn.make_cursor(CursorWrapper(conn.connection.cursor(SSCursor)))
+    # a named cursor on postgresql, the others fall back to a client-side cursor.
+    return conn.chunked_cursor()
+
+
+def _iter_chunks(cursor, chunk_size):
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            break
+        for row in rows:
+            yield row
+
+
+@contextmanager
+def stream_expression(stmt, conn=None, dialect=None, database='default',
+                      as_col_dict=True, dict_method=OrderedDict, chunk_size=1000):
+    """It streams `SELECT` results through a server-side cursor, and closes the cursor when the scope exits.
+
+    :stmt: sqlalchemy expression object
+    :as_col_dict:
+      default: True,
+    :chunk_size: number of rows fetched at once.
+      default: 1000,
+    """
+    conn, dialect = _complement(conn, dialect, database)
+    sql, params = _compile(stmt, dialect)
+    cursor = _server_side_cursor(conn)
+    try:
+        _execute_cursor(cursor, sql, params, raise_error=True)
+        rows = _iter_chunks(cursor, chunk_size)
+        if as_col_dict:
+            rows = map(_row_maker(stmt, dict_method), rows)
+        yield rows
+    finally:
+        cursor.close()
+
+
+def _get_query_executor(max_workers):
+    with _registry_lock:
+        executor = _query_executors.get(max_workers)
+        if executor is None:
+            executor = _query_executors[max_workers] = ThreadPoolExecutor(max_workers=max_workers)
+        return executor
+
+
+def _query_in_worker(stmt, dialect, database, options):
+    conn = connections[database]
+    # the same as the beginning and the end of a request, it respects `CONN_MAX_AGE`.
+    conn.close_if_unusable_or_obsolete()
+    start = time.perf_counter()
+    try:
+        result = query_expression(stmt, conn=conn, dialect=dialect, database=database, **options)
+    except Exception as e:
+        return QueryResult(None, e, time.perf_counter() - start)
+    finally:
+        conn.close_if_unusable_or_obsolete()
+    return QueryResult(result, None, time.perf_counter() - start)
+
+
+def query_many(stmts, max_workers=None, dialect=None, database='default', raise_error=False, **options):
+    """It runs independent `SELECT` statements concurrently, and returns a list of `QueryResult` in the same order.
+
+    Each statement runs on a django connection of a worker thread, the connections are kept
+    between calls within `CONN_MAX_AGE`. Uncommitted data of the caller's transaction is not visible to them.
+
+    :stmts: sqlalchemy expression objects
+    :max_workers: number of worker threads (connections).
+      default: ``D2A_CONFIG['QUERY_MANY_WORKERS']`` or 4,
+    :raise_error: if raising the first error (in order of the statements) after all statements finished or not.
+      default: False, the error is set to `QueryResult.error` instead.
+    :options: arguments of `query_expression` (`as_col_dict`, `dict_method`, `as_columns` and so on).
+    """
+    stmts = list(stmts)
+    if not stmts:
+        return []
+    max_workers = max_workers or D2A_CONFIG.get('QUERY_MANY_WORKERS', 4)
+    options.update(as_row_list=True, raise_error=True)
+    executor = _get_query_executor(max_workers)
+    futures = [executor.submit(_query_in_worker, stmt, dialect, database, options) for stmt in stmts]
+    results = [future.result() for future in futures]
+    if raise_error:
+        for result in results:
+            if result.error is not None:
+                raise result.error
+    return results
+
+
 def execute_expression(stmt, conn=None, dialect=None, database='default', debug={}):
     conn, dialect = _complement(conn, dialect, database)
-    binded = stmt.compile(dialect=dialect())
-    sql, params = DIALECT_MAPPING[dialect](str(binded), binded)
+    sql, params = _compile(stmt, dialect)
     with conn.cursor() as cursor:
         _execute_cursor(cursor, sql, params)
         if debug:
@@ -158,6 +522,104 @@ def execute_expression(stmt, conn=None, dialect=None, database='default', debug=
         return cursor.rowcount
 
 
+def _batches(rows, batch_size):
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            break
+        yield batch
+
+
+def _executemany(cursor, stmt, sql, params_list):
+    # mysqlclient rewrites INSERT into a multi-row INSERT by itself.
+    cursor.executemany(sql, params_list)
+    return cursor.rowcount
+
+
+def _split_values(values):
+    """It splits the sql following `VALUES` into the tuple of a row and the rest (e.g. `ON CONFLICT`)."""
+    depth = 0
+    quoted = False
+    for i, char in enumerate(values):
+        if char == "'":
+            quoted = not quoted
+        elif quoted:
+            continue
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+            if depth == 0:
+                return values[:i + 1], values[i + 1:]
+    return values, ''
+
+
+def _execute_values(cursor, stmt, sql, params_list):
+    head, _, values = sql.partition(' VALUES ')
+    template, tail = _split_values(values)
+    # params in the rest (e.g. `ON CONFLICT DO UPDATE SET`) can't be passed with the rows.
+    if not isinstance(stmt, Insert) or not template or ' RETURNING ' in tail or re.search(r'(?<!%)%[(s]', tail):
+        # execute_batch is not used because it loses the rowcount.
+        return _executemany(cursor, stmt, sql, params_list)
+
+    from psycopg2.extras import execute_values
+    execute_values(cursor.cursor, head + ' VALUES %s' + tail, params_list,
+                   template=template, page_size=len(params_list))
+    return cursor.rowcount
+
+
+EXECUTEMANY = {
+    'postgresql': _execute_values,
+}
+
+# it omits primary keys to be pre-executed, SQLAlchemy 1.4 or later renamed the option.
+_EXECUTEMANY_COMPILE_KWARGS = {'for_executemany': True} if hasattr(Insert, '_generate_cache_key') else {'inline': True}
+
+
+def execute_many(stmt, rows, conn=None, dialect=None, database='default', batch_size=1000):
+    """It executes the statement for each row in batches, and returns num of records having been affected.
+
+    :stmt: sqlalchemy insert, update or delete expression object, which is compiled only once.
+    :rows: iterable of dict, whose keys are columns or names of `bindparam`.
+    :batch_size: number of rows sent at once.
+      default: 1000,
+    """
+    conn, dialect = _complement(conn, dialect, database)
+    batches = _batches(rows, batch_size)
+    first = next(batches, None)
+    if first is None:
+        return 0
+
+    binded = stmt.compile(dialect=_get_dialect(dialect), column_keys=list(first[0]), **_EXECUTEMANY_COMPILE_KWARGS)
+    sql, extract = _sql_converter(dialect)(str(binded), binded)
+    # python-side defaults of the columns omitted in the rows.
+    defaults = [
+        c for c in getattr(binded, 'insert_prefetch', [])
+        if c.default is not None and not c.default.is_sequence
+    ]
+
+    def bind(row):
+        if defaults:
+            row = dict(row)
+            for c in defaults:
+                if c.key not in row:
+                    row[c.key] = c.default.arg(None) if c.default.is_callable else c.default.arg
+        return extract(binded.construct_params(row))
+
+    executemany = EXECUTEMANY.get(conn.vendor, _executemany)
+    rowcount = 0
+    with conn.cursor() as cursor:
+        for batch in chain([first], batches):
+            params_list = [bind(row) for row in batch]
+            try:
+                rowcount += executemany(cursor, stmt, sql, params_list)
+            except Exception:
+                logger.exception('param:%s\nsql:%s', params_list[:1], sql)
+                raise
+    return rowcount
+
+
 def show_debug(cursor, sql, params, options={}):
     printer = options.get('printer', logger.debug)
     delimiter = options.get('delimiter', '=' * 100 + '\n')
@@ -202,19 +664,101 @@ def show_explain(cursor, printer, delimiter, database, sql, params, explain_pref
     printer(delimiter + sql)
 
 
+def _freeze(value):
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
 def make_engine(db_type=None, database='default', **options):
-    uri = URI[db_type or _detect_db_type(database)]
-    return create_engine(uri.format(**settings.DATABASES[database]), **options)
+    """It returns an engine of the django database, the engine is shared within the process.
+
+    :param str db_type: Key of `URI`. If omitted this option, it will be detected from django settings.
+    :param str database: Django database alias.
+    :param options: `create_engine` arguments, they are merged into ``D2A_CONFIG['ENGINE_OPTIONS'][database]``.
+    """
+    options = dict(D2A_CONFIG.get('ENGINE_OPTIONS', {}).get(database, {}), **options)
+    db_type = db_type or _detect_db_type(database)
+    key = (db_type, database, _freeze(options))
+    with _registry_lock:
+        engine = _engines.get(key)
+        if engine is None:
+            uri = URI[db_type]
+            engine = _engines[key] = create_engine(uri.format(**settings.DATABASES[database]), **options)
+        return engine
+
+
+def dispose_engines():
+    """It disposes all engines made by `make_engine` and forgets them.
+    """
+    with _registry_lock:
+        for engine in _engines.values():
+            engine.dispose()
+        _engines.clear()
+        _sessionmakers.clear()
+
+
+def warm_up_engines(connections=1):
+    """It opens connections of all engines made by `make_engine` in advance.
+
+    :param int connections: Number of connections opened per engine.
+    """
+    with _registry_lock:
+        engines = list(_engines.values())
+    for engine in engines:
+        conns = [engine.connect() for _ in range(connections)]
+        for conn in conns:
+            conn.close()
+
+
+def _after_fork_in_child():
+    global _registry_lock, _sync_executor
+    # locks might have been held by other threads of the parent.
+    _registry_lock = threading.Lock()
+    compiled_cache._lock = threading.Lock()
+    # threads are not inherited.
+    _sync_executor = None
+    _query_executors.clear()
+    for engine in list(_engines.values()) + [e.sync_engine for e in _async_engines.values()]:
+        _inherited_pools.append(engine.pool)
+        engine.pool = engine.pool.recreate()
+
+    connections = D2A_CONFIG.get('WARM_UP_CONNECTIONS', 0)
+    if connections:
+        try:
+            warm_up_engines(connections)
+        except Exception:
+            logger.exception('An error occured during warming up the engines.')
+
+
+if hasattr(os, 'register_at_fork'):
+    # python 3.7 or later
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+def _get_sessionmaker(engine, **options):
+    if options.get('info') is not None:
+        return sessionmaker(engine, **options)
+
+    key = (engine, _freeze(options))
+    with _registry_lock:
+        Session = _sessionmakers.get(key)
+        if Session is None:
+            Session = _sessionmakers[key] = sessionmaker(engine, **options)
+        return Session
 
 
 @contextmanager
 def make_session(engine=None,
                  autoflush=True, autocommit=False,
                  expire_on_commit=True, info=None):
-    engine = engine or make_engine()
-    Session = sessionmaker(engine,
-                           autoflush=autoflush, autocommit=autocommit,
-                           expire_on_commit=expire_on_commit, info=info)
+    if engine is None or isinstance(engine, basestring):
+        engine = make_engine(engine)
+    Session = _get_sessionmaker(engine,
+                                autoflush=autoflush, autocommit=autocommit,
+                                expire_on_commit=expire_on_commit, info=info)
     session = Session()
     try:
         yield session
@@ -230,5 +774,180 @@ def make_session(engine=None,
         session.close()
 
 
+def _run_in_executor(func):
+    async def run(*args, **kwargs):
+        global _sync_executor
+        with _registry_lock:
+            if _sync_executor is None:
+                _sync_executor = ThreadPoolExecutor(max_workers=1)
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(_sync_executor, partial(func, *args, **kwargs))
+    return run
+
+
+def _sync_to_async(func):
+    """It makes the function awaitable, it runs in the thread for django connections.
+
+    Django connections belong to the thread, so the function runs in the same thread as the other sync code
+    (``thread_sensitive``) or in a single dedicated thread without asgiref.
+    """
+    if sync_to_async is not None:
+        return sync_to_async(func, thread_sensitive=True)
+    return _run_in_executor(func)
+
+
+async def async_query_expression(stmt, dialect=None, database='default',
+                                 as_col_dict=True, dict_method=OrderedDict, debug={},
+                                 as_columns=False, chunk_size=1000):
+    """`query_expression` without blocking the event loop, it returns a list of rows (or columns).
+
+    Options are the same as `query_expression`.
+    """
+    return await _sync_to_async(query_expression)(
+        stmt, dialect=dialect, database=database,
+        as_col_dict=as_col_dict, as_row_list=True, dict_method=dict_method, debug=debug,
+        as_columns=as_columns, chunk_size=chunk_size,
+    )
+
+
+async def async_execute_expression(stmt, dialect=None, database='default', debug={}):
+    """`execute_expression` without blocking the event loop, it returns num of affected rows.
+    """
+    return await _sync_to_async(execute_expression)(stmt, dialect=dialect, database=database, debug=debug)
+
+
+class AsyncRows(object):
+    """Async iterator of rows streamed by `async_stream_expression`, a chunk of rows is fetched at once.
+    """
+
+    def __init__(self, rows, chunk_size):
+        self._fetch = _sync_to_async(lambda: list(islice(rows, chunk_size)))
+        self._chunk = iter(())
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._chunk)
+        except StopIteration:
+            pass
+        chunk = await self._fetch()
+        if not chunk:
+            raise StopAsyncIteration
+        self._chunk = iter(chunk)
+        return next(self._chunk)
+
+
+class _AsyncStream(object):
+
+    def __init__(self, context, chunk_size):
+        self._context = context
+        self._chunk_size = chunk_size
+
+    async def __aenter__(self):
+        rows = await _sync_to_async(self._context.__enter__)()
+        return AsyncRows(rows, self._chunk_size)
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return await _sync_to_async(self._context.__exit__)(exc_type, exc, tb)
+
+
+def async_stream_expression(stmt, dialect=None, database='default',
+                            as_col_dict=True, dict_method=OrderedDict, chunk_size=1000):
+    """`stream_expression` for ``async with``, it gives an async iterator of rows.
+
+    :chunk_size: number of rows fetched at once, each fetch runs in the thread for django connections.
+      default: 1000,
+    """
+    context = stream_expression(stmt, dialect=dialect, database=database,
+                                as_col_dict=as_col_dict, dict_method=dict_method, chunk_size=chunk_size)
+    return _AsyncStream(context, chunk_size)
+
+
+def _import_sqlalchemy_asyncio():
+    try:
+        from sqlalchemy.ext import asyncio as sa_asyncio
+    except ImportError:
+        raise ImportError('Async engines require "SQLAlchemy>=1.4". Do as follows: "pip install -U sqlalchemy".')
+    return sa_asyncio
+
+
+def make_async_engine(db_type=None, database='default', **options):
+    """It returns an async engine of the django database, the engine is shared within the process.
+
+    It requires SQLAlchemy 1.4 or later and an async driver (asyncpg, aiomysql or aiosqlite).
+
+    :param str db_type: Key of `ASYNC_URI`. If omitted this option, it will be detected from django settings.
+    :param str database: Django database alias.
+    :param options: `create_async_engine` arguments, they are merged into ``D2A_CONFIG['ENGINE_OPTIONS'][database]``.
+    """
+    sa_asyncio = _import_sqlalchemy_asyncio()
+    options = dict(D2A_CONFIG.get('ENGINE_OPTIONS', {}).get(database, {}), **options)
+    db_type = db_type or _detect_db_type(database)
+    key = (db_type, database, _freeze(options))
+    with _registry_lock:
+        engine = _async_engines.get(key)
+        if engine is None:
+            uri = ASYNC_URI[db_type]
+            engine = _async_engines[key] = sa_asyncio.create_async_engine(
+                uri.format(**settings.DATABASES[database]), **options)
+        return engine
+
+
+async def async_dispose_engines():
+    """It disposes all engines made by `make_async_engine` and forgets them.
+    """
+    with _registry_lock:
+        engines = list(_async_engines.values())
+        _async_engines.clear()
+    for engine in engines:
+        await engine.dispose()
+
+
+class _AsyncSessionContext(object):
+
+    def __init__(self, engine, options):
+        self._engine = engine
+        self._options = options
+        self._session = None
+
+    async def __aenter__(self):
+        engine = self._engine
+        if engine is None or isinstance(engine, basestring):
+            engine = make_async_engine(engine)
+        Session = _get_sessionmaker(engine, class_=_import_sqlalchemy_asyncio().AsyncSession, **self._options)
+        self._session = Session()
+        return self._session
+
+    async def __aexit__(self, exc_type, exc, tb):
+        session = self._session
+        try:
+            if exc_type is None:
+                if not self._options['autoflush']:
+                    await session.flush()
+                await session.commit()
+                return False
+            await session.rollback()
+            if not issubclass(exc_type, Exception):
+                return False
+            logger.error('An error occured during executing the statements.', exc_info=(exc_type, exc, tb))
+            return True
+        finally:
+            await session.close()
+
+
+def async_make_session(engine=None, autoflush=True, expire_on_commit=False, info=None):
+    """`make_session` for ``async with``, it gives ``AsyncSession`` of `make_async_engine`.
+
+    `expire_on_commit` is disabled by default, because expired attributes can not be loaded implicitly in coroutines.
+    """
+    return _AsyncSessionContext(engine, {
+        'autoflush': autoflush,
+        'expire_on_commit': expire_on_commit,
+        'info': info,
+    })
+
+
 AUTO_DETECTED_DB_TYPE = _detect_db_type()
 
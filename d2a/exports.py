@@ -0,0 +1,155 @@
+# coding: utf-8
+from itertools import islice
+
+from sqlalchemy.sql import sqltypes
+from sqlalchemy.dialects import postgresql as postgresql_types
+
+from .db import stream_expression
+from .loaders import serializer
+
+"""
+Arrow exporters
+
+  - https://arrow.apache.org/docs/python/api/datatypes.html
+  - https://arrow.apache.org/docs/python/parquet.html
+  - https://arrow.apache.org/docs/python/feather.html
+
+"""
+
+FORMATS = {
+    '.parquet': 'parquet',
+    '.pq': 'parquet',
+    '.feather': 'feather',
+    '.arrow': 'feather',
+    '.ipc': 'feather',
+}
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError('Exporting requires "pyarrow". Do as follows: "pip install pyarrow".')
+    return pyarrow
+
+
+def _decimal(pa, t):
+    if t.precision and t.precision <= 38:
+        return pa.decimal128(t.precision, t.scale or 0), None
+    return pa.string(), str
+
+
+def _list(pa, t):
+    item_type, convert = arrow_type(pa, t.item_type)
+    if convert is None:
+        return pa.list_(item_type), None
+    return pa.list_(item_type), lambda value: [None if v is None else convert(v) for v in value]
+
+
+def _to_wkb(value):
+    if isinstance(value, str):
+        # hex returned by psycopg2
+        return bytes.fromhex(value)
+    # WKBElement of GeoAlchemy2 or GEOSGeometry of GeoDjango
+    return bytes(getattr(value, 'data', None) or value.wkb)
+
+
+# sqlalchemy type class -> function(pyarrow, sqlalchemy type) returning arrow type and a function converting value.
+# the others become strings represented by `d2a.loaders.serializer`.
+ARROW_TYPES = {
+    sqltypes.Integer: lambda pa, t: (pa.int64(), None),
+    sqltypes.Float: lambda pa, t: (pa.float64(), None),
+    sqltypes.Numeric: _decimal,
+    sqltypes.Boolean: lambda pa, t: (pa.bool_(), None),
+    sqltypes.DateTime: lambda pa, t: (pa.timestamp('us', tz='UTC' if t.timezone else None), None),
+    sqltypes.Date: lambda pa, t: (pa.date32(), None),
+    sqltypes.Time: lambda pa, t: (pa.time64('us'), None),
+    sqltypes._AbstractInterval: lambda pa, t: (pa.duration('us'), None),
+    sqltypes.String: lambda pa, t: (pa.string(), None),
+    sqltypes._Binary: lambda pa, t: (pa.binary(), bytes),
+    sqltypes.ARRAY: _list,
+    postgresql_types.HSTORE: lambda pa, t: (pa.map_(pa.string(), pa.string()), lambda value: list(value.items())),
+}
+
+try:
+    from geoalchemy2 import types as geotypes
+    ARROW_TYPES[geotypes._GISType] = lambda pa, t: (pa.binary(), _to_wkb)
+except ImportError:
+    pass
+
+
+def arrow_type(pa, sa_type):
+    """It returns arrow type of the column type and a function converting value (or ``None``).
+
+    :param pa: ``pyarrow`` module.
+    :param sqlalchemy.types.TypeEngine sa_type: Column type (instance or class).
+    """
+    sa_type = sa_type() if isinstance(sa_type, type) else sa_type
+    for cls in type(sa_type).__mro__:
+        if cls in ARROW_TYPES:
+            return ARROW_TYPES[cls](pa, sa_type)
+    return pa.string(), serializer(sa_type)
+
+
+def _detect_format(path, format):
+    if format:
+        return format
+    for ext, format in FORMATS.items():
+        if str(path).endswith(ext):
+            return format
+    return 'parquet'
+
+
+def _open_writer(pa, path, schema, format, options):
+    if format == 'parquet':
+        import pyarrow.parquet as pq
+        return pq.ParquetWriter(path, schema, **options)
+    if format == 'feather':
+        return pa.ipc.new_file(path, schema, options=pa.ipc.IpcWriteOptions(**options))
+    raise ValueError('Unknown format: {}'.format(format))
+
+
+def write_batches(rows, columns, path, format=None, batch_size=10000, **options):
+    """It writes rows (tuples) into a Parquet or Feather file by record batches, and returns num of rows.
+
+    :param rows: Iterable of tuple, it is consumed lazily.
+    :param columns: Columns of the rows, for example ``stmt.c``.
+    :param str format: `parquet` or `feather`. If omitted this option, it is detected from the extension of the path.
+    :param int batch_size: number of rows per record batch.
+    :param options: Arguments of ``pyarrow.parquet.ParquetWriter`` or ``pyarrow.ipc.IpcWriteOptions``.
+    """
+    pa = _import_pyarrow()
+    columns = list(columns)
+    types = [arrow_type(pa, c.type) for c in columns]
+    schema = pa.schema([
+        pa.field(c.name, t, nullable=getattr(c, 'nullable', True)) for c, (t, _) in zip(columns, types)
+    ])
+    rows = iter(rows)
+    total = 0
+    with _open_writer(pa, path, schema, _detect_format(path, format), options) as writer:
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                break
+            arrays = []
+            for (arrow_t, convert), values in zip(types, zip(*batch)):
+                if convert is not None:
+                    values = [None if v is None else convert(v) for v in values]
+                arrays.append(pa.array(values, type=arrow_t))
+            writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+            total += len(batch)
+    return total
+
+
+def export_query(stmt, path, format=None, batch_size=10000, conn=None, dialect=None, database='default', **options):
+    """It streams `SELECT` results through a server-side cursor into a Parquet or Feather file, and returns num of rows.
+
+    :stmt: sqlalchemy expression object
+    :path: file path, the format is detected from the extension (`.parquet`, `.feather`, `.arrow`)
+      unless `format` is specified.
+    :batch_size: number of rows fetched and written at once.
+      default: 10000,
+    """
+    with stream_expression(stmt, conn=conn, dialect=dialect, database=database,
+                           as_col_dict=False, chunk_size=batch_size) as rows:
+        return write_batches(rows, stmt.c, path, format=format, batch_size=batch_size, **options)
@@ -1,16 +1,13 @@
 # coding: utf-8
+import importlib
+import sys
+import threading
 import warnings
 
 from django.db import models
 from django.conf import settings
-from django.contrib.postgres import fields as postgres_fields
 
 from sqlalchemy import types as default_types
-from sqlalchemy.dialects import (
-    postgresql as postgresql_types,
-    mysql as mysql_types,
-    oracle as oracle_types,
-)
 
 from .compat import M2MField
 from .original_types import CIText
@@ -39,13 +36,61 @@ Mapping definition
 """
 
 
+class TypeRef(object):
+    """Type class of a sqlalchemy dialect, the dialect module is imported on `load`."""
+    __slots__ = ('dialect', 'name', '_type')
+
+    def __init__(self, dialect, name):
+        self.dialect = dialect
+        self.name = name
+        self._type = None
+
+    def load(self):
+        if self._type is None:
+            module = importlib.import_module('sqlalchemy.dialects.{}'.format(self.dialect))
+            self._type = getattr(module, self.name)
+        return self._type
+
+    def __repr__(self):
+        return '<TypeRef {}.{}>'.format(self.dialect, self.name)
+
+
+class DialectTypes(object):
+    """Namespace of `TypeRef`,
+    e.g. ``DialectTypes('mysql').INTEGER`` refers to ``sqlalchemy.dialects.mysql.INTEGER``.
+    """
+
+    def __init__(self, dialect):
+        self._dialect = dialect
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        ref = TypeRef(self._dialect, name)
+        setattr(self, name, ref)
+        return ref
+
+
+def load_type(col_type):
+    """It returns the type class of `TypeRef`, the others are returned as is."""
+    return col_type.load() if isinstance(col_type, TypeRef) else col_type
+
+
+# dialect modules are imported when the types are used.
+postgresql_types = DialectTypes('postgresql')
+mysql_types = DialectTypes('mysql')
+oracle_types = DialectTypes('oracle')
+
+
 def alias(new_field, existing_field):
     """It defines a new converting rule same with existing one.
 
     :param django.db.models.fields.Field new_field: A field which you want to add.
     :param django.db.models.fields.Field existing_field: A field copied from.
     """
+    load_optional_rules()
     mapping[new_field] = mapping[existing_field]
+    _resolved.clear()
 
 
 def alias_dict(extra_mapping={}):
@@ -53,8 +98,26 @@ def alias_dict(extra_mapping={}):
         alias(new_field, existing_field)
 
 
+def resolve(field_type):
+    """It returns the converting rule of the nearest class in the MRO of the field type, or ``None``.
+
+    For example, a subclass of ``EmailField`` is converted as ``EmailField`` without `alias`.
+    The result is memoized per field type, so add rules by `alias` rather than updating `mapping` directly.
+    """
+    try:
+        return _resolved[field_type]
+    except KeyError:
+        pass
+    load_optional_rules()
+    rule = _resolved[field_type] = next((mapping[cls] for cls in field_type.__mro__ if cls in mapping), None)
+    return rule
+
+
 D2A_CONFIG = getattr(settings, 'D2A_CONFIG', {})
 
+# field type -> rule resolved by `resolve`
+_resolved = {}
+
 mapping = {
     models.AutoField: {
         '__default_type__': default_types.INTEGER,
@@ -284,7 +347,7 @@ mapping = {
     },
     models.ForeignKey: {
         '__callback__': lambda f: {
-            '__callback__': lambda f: (mapping[type(f.target_field)], f.target_field),
+            '__callback__': lambda f: (resolve(type(f.target_field)), f.target_field),
             '__rel_kwargs__': {
                 '__logical_name__': f.name,
                 '__back__': f.related_query_name(),
@@ -298,7 +361,7 @@ mapping = {
     },
     models.OneToOneField: {
         '__callback__': lambda f: {
-            '__callback__': lambda f: (mapping[type(f.target_field)], f.target_field),
+            '__callback__': lambda f: (resolve(type(f.target_field)), f.target_field),
             '__rel_kwargs__': {
                 '__logical_name__': f.name,
                 '__back__': f.related_query_name(),
@@ -381,29 +444,6 @@ try:
 except AttributeError:
     pass
 
-try:
-    mapping[postgres_fields.ArrayField] = {
-        '__default_type__': postgresql_types.ARRAY,
-        '__postgresql_type__': postgresql_types.ARRAY,
-        '__mysql_type__': default_types.ARRAY,
-        '__oracle_type__': default_types.ARRAY,
-        '__callback__': lambda f: {
-            '__default_type_kwargs__': {'item_type': mapping[type(f.base_field)]['__default_type__']},
-            '__postgresql_type_kwargs__': {'item_type': mapping[type(f.base_field)].get('__postgresql_type__') or mapping[type(f.base_field)]['__default_type__']},
-        },
-    }
-except AttributeError:
-    pass
-
-try:
-    mapping[postgres_fields.HStoreField] = {
-        '__default_type__': postgresql_types.HSTORE,
-        '__postgresql_type__': postgresql_types.HSTORE,
-    }
-except AttributeError:
-    pass
-
-
 # Never matched. For alias of 3rd-party.
 JSONType, JSONRule = 'JSONType', {
     '__default_type__': default_types.JSON,
@@ -414,92 +454,142 @@ JSONType, JSONRule = 'JSONType', {
 
 mapping[JSONType] = JSONRule
 
-try:
-    mapping[postgres_fields.JSONField] = {
-        **JSONRule,
-        '__default_type__': postgresql_types.JSONB,
-        '__postgresql_type__': postgresql_types.JSONB,
-    }
-except AttributeError:
-    pass
 
-try:
-    mapping[postgres_fields.CICharField] = {
-        '__default_type__': CIText,
-        '__postgresql_type__': CIText,
-    }
-except AttributeError:
-    pass
+def _load_postgres_rules():
+    from django.contrib.postgres import fields as postgres_fields
 
-try:
-    mapping[postgres_fields.CIEmailField] = {
-        '__default_type__': CIText,
-        '__postgresql_type__': CIText,
-    }
-except AttributeError:
-    pass
+    try:
+        mapping[postgres_fields.ArrayField] = {
+            '__default_type__': postgresql_types.ARRAY,
+            '__postgresql_type__': postgresql_types.ARRAY,
+            '__mysql_type__': default_types.ARRAY,
+            '__oracle_type__': default_types.ARRAY,
+            '__callback__': lambda f: {
+                '__default_type_kwargs__': {'item_type': load_type(resolve(type(f.base_field))['__default_type__'])},
+                '__postgresql_type_kwargs__': {'item_type': load_type(resolve(type(f.base_field)).get('__postgresql_type__') or resolve(type(f.base_field))['__default_type__'])},
+            },
+        }
+    except AttributeError:
+        pass
 
-try:
-    mapping[postgres_fields.CITextField] = {
-        '__default_type__': CIText,
-        '__postgresql_type__': CIText,
-    }
-except AttributeError:
-    pass
+    try:
+        mapping[postgres_fields.HStoreField] = {
+            '__default_type__': postgresql_types.HSTORE,
+            '__postgresql_type__': postgresql_types.HSTORE,
+        }
+    except AttributeError:
+        pass
+
+    try:
+        mapping[postgres_fields.JSONField] = {
+            **JSONRule,
+            '__default_type__': postgresql_types.JSONB,
+            '__postgresql_type__': postgresql_types.JSONB,
+        }
+    except AttributeError:
+        pass
 
-try:
-    mapping[postgres_fields.IntegerRangeField] = {
-        '__default_type__': postgresql_types.INT4RANGE,
-        '__postgresql_type__': postgresql_types.INT4RANGE,
-    }
-except AttributeError:
-    pass
+    try:
+        mapping[postgres_fields.CICharField] = {
+            '__default_type__': CIText,
+            '__postgresql_type__': CIText,
+        }
+    except AttributeError:
+        pass
 
-try:
-    mapping[postgres_fields.BigIntegerRangeField] = {
-        '__default_type__': postgresql_types.INT8RANGE,
-        '__postgresql_type__': postgresql_types.INT8RANGE,
-    }
-except AttributeError:
-    pass
+    try:
+        mapping[postgres_fields.CIEmailField] = {
+            '__default_type__': CIText,
+            '__postgresql_type__': CIText,
+        }
+    except AttributeError:
+        pass
 
-try:
-    mapping[postgres_fields.DecimalRangeField] = {
-        '__default_type__': postgresql_types.NUMRANGE,
-        '__postgresql_type__': postgresql_types.NUMRANGE,
-    }
-except AttributeError:
-    pass
+    try:
+        mapping[postgres_fields.CITextField] = {
+            '__default_type__': CIText,
+            '__postgresql_type__': CIText,
+        }
+    except AttributeError:
+        pass
 
-try:
-    # deprecated
-    mapping[postgres_fields.FloatRangeField] = {
-        '__default_type__': postgresql_types.NUMRANGE,
-        '__postgresql_type__': postgresql_types.NUMRANGE,
-    }
-except AttributeError:
-    pass
+    try:
+        mapping[postgres_fields.IntegerRangeField] = {
+            '__default_type__': postgresql_types.INT4RANGE,
+            '__postgresql_type__': postgresql_types.INT4RANGE,
+        }
+    except AttributeError:
+        pass
 
-try:
-    mapping[postgres_fields.DateTimeRangeField] = {
-        '__default_type__': postgresql_types.TSTZRANGE if settings.USE_TZ else postgresql_types.TSRANGE,
-        '__postgresql_type__': postgresql_types.TSTZRANGE if settings.USE_TZ else postgresql_types.TSRANGE,
-    }
-except AttributeError:
-    pass
+    try:
+        mapping[postgres_fields.BigIntegerRangeField] = {
+            '__default_type__': postgresql_types.INT8RANGE,
+            '__postgresql_type__': postgresql_types.INT8RANGE,
+        }
+    except AttributeError:
+        pass
 
-try:
-    mapping[postgres_fields.DateRangeField] = {
-        '__default_type__': postgresql_types.DATERANGE,
-        '__postgresql_type__': postgresql_types.DATERANGE,
-    }
-except AttributeError:
-    pass
+    try:
+        mapping[postgres_fields.DecimalRangeField] = {
+            '__default_type__': postgresql_types.NUMRANGE,
+            '__postgresql_type__': postgresql_types.NUMRANGE,
+        }
+    except AttributeError:
+        pass
+
+    try:
+        # deprecated
+        mapping[postgres_fields.FloatRangeField] = {
+            '__default_type__': postgresql_types.NUMRANGE,
+            '__postgresql_type__': postgresql_types.NUMRANGE,
+        }
+    except AttributeError:
+        pass
+
+    try:
+        mapping[postgres_fields.DateTimeRangeField] = {
+            '__default_type__': postgresql_types.TSTZRANGE if settings.USE_TZ else postgresql_types.TSRANGE,
+            '__postgresql_type__': postgresql_types.TSTZRANGE if settings.USE_TZ else postgresql_types.TSRANGE,
+        }
+    except AttributeError:
+        pass
+
+    try:
+        mapping[postgres_fields.DateRangeField] = {
+            '__default_type__': postgresql_types.DATERANGE,
+            '__postgresql_type__': postgresql_types.DATERANGE,
+        }
+    except AttributeError:
+        pass
+
+
+def _load_geoalchemy2_rules():
+    try:
+        from .geoalchemy2 import geo_mapping
+        mapping.update(geo_mapping)
+
+    except (ImportError, AttributeError) as e:
+        if D2A_CONFIG.get('USE_GEOALCHEMY2', False):
+            warnings.warn(
+                'An error occured: {}. HINT: GeoAlchemy2 should be installed when you use GeoDjango.'.format(e))
+
+
+# module of optional fields -> function adding their rules to `mapping`.
+# it is called once the module is imported, since the fields can't be used until then.
+_optional_rules = {
+    'django.contrib.postgres.fields': _load_postgres_rules,
+    'django.contrib.gis.db.models': _load_geoalchemy2_rules,
+}
+
+
+# held until the rules are loaded, otherwise other threads resolve fields before that.
+_optional_lock = threading.RLock()
 
-try:
-    from .geoalchemy2 import geo_mapping
-    mapping.update(geo_mapping)
 
-except (ImportError, AttributeError) as e:
-    if D2A_CONFIG.get('USE_GEOALCHEMY2', False):
-        warnings.warn('An error occured: {}. HINT: GeoAlchemy2 should be installed when you use GeoDjango.'.format(e))
+def load_optional_rules():
+    """It adds rules of optional fields (e.g. `django.contrib.postgres`) whose modules have been imported."""
+    with _optional_lock:
+        for module in [m for m in list(_optional_rules) if m in sys.modules]:
+            load = _optional_rules.pop(module)
+            load()
+            _resolved.clear()
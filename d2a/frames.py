@@ -0,0 +1,101 @@
+# coding: utf-8
+from collections import OrderedDict
+
+from sqlalchemy import insert
+
+from .db import query_expression, execute_many, _complement
+from .loaders import copy_rows
+
+"""
+DataFrame reader and writer
+
+  - https://pandas.pydata.org/docs/user_guide/integer_na.html
+  - https://pandas.pydata.org/docs/user_guide/boolean.html
+
+"""
+
+
+def _import_pandas():
+    try:
+        import pandas
+    except ImportError:
+        raise ImportError('DataFrame requires "pandas". Do as follows: "pip install pandas".')
+    return pandas
+
+
+def _to_series_data(pd, array):
+    """It converts a (masked) array made by `fetch_columns` into data of a series keeping the dtype."""
+    mask = getattr(array, 'mask', None)
+    if mask is None:
+        return array
+    kind = array.dtype.kind
+    if kind == 'i':
+        return pd.arrays.IntegerArray(array.data, mask.copy())
+    if kind == 'b':
+        return pd.arrays.BooleanArray(array.data, mask.copy())
+    if kind == 'f':
+        return array.filled(float('nan'))
+    # datetime64 and timedelta64 are already filled with NaT.
+    return array.data
+
+
+def read_frame(stmt, conn=None, dialect=None, database='default', chunk_size=10000):
+    """It retrieves `SELECT` results as a DataFrame, and the dtypes are derived from the column types.
+
+    :stmt: sqlalchemy expression object
+    :chunk_size: number of rows converted to arrays at once.
+      default: 10000,
+    """
+    pd = _import_pandas()
+    columns = query_expression(stmt, conn=conn, dialect=dialect, database=database,
+                               as_columns=True, chunk_size=chunk_size)
+    return pd.DataFrame(
+        OrderedDict((name, _to_series_data(pd, array)) for name, array in columns.items()),
+        columns=list(columns),
+    )
+
+
+def _to_python_values(pd, series):
+    """It converts the series into an object array of python values, NaN, NaT and NA become ``None``.
+
+    ``Timestamp`` and ``Timedelta`` become ``datetime`` and ``timedelta``, since DB-API drivers may not accept them.
+    """
+    kind = series.dtype.kind
+    if kind == 'M':
+        values = pd.DatetimeIndex(series).to_pydatetime()
+    elif kind == 'm':
+        values = pd.TimedeltaIndex(series).to_pytimedelta()
+    else:
+        values = series.astype(object).to_numpy()
+    values = values.astype(object)
+    values[series.isna().to_numpy()] = None
+    return values
+
+
+def _frame_rows(df, batch_size):
+    """It yields rows of the DataFrame as tuples of python objects, NaN, NaT and NA become ``None``."""
+    pd = _import_pandas()
+    for start in range(0, len(df), batch_size):
+        chunk = df.iloc[start:start + batch_size]
+        columns = [_to_python_values(pd, chunk.iloc[:, i]) for i in range(chunk.shape[1])]
+        for row in zip(*columns):
+            yield row
+
+
+def write_frame(df, table, conn=None, dialect=None, database='default', batch_size=10000):
+    """It inserts rows of the DataFrame into the table, and returns num of records.
+
+    Names of the DataFrame columns should be keys of the table columns.
+    It uses `copy_rows` on PostgreSQL, otherwise `execute_many`.
+
+    :param table: SQLAlchemy ``Table`` or declarative class, for example made by `transfer` or `declare`.
+    :param int batch_size: number of rows converted (and sent) at once.
+    """
+    table = getattr(table, '__table__', table)
+    conn, dialect = _complement(conn, dialect, database)
+    keys = [str(c) for c in df.columns]
+    rows = _frame_rows(df, batch_size)
+    if conn.vendor == 'postgresql':
+        return copy_rows(table, rows, columns=keys, conn=conn, database=database)
+    return execute_many(insert(table), (dict(zip(keys, row)) for row in rows),
+                        conn=conn, dialect=dialect, database=database, batch_size=batch_size)
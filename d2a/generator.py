@@ -0,0 +1,233 @@
+# coding: utf-8
+import importlib
+from collections import OrderedDict
+from collections.abc import Mapping
+
+from .parsers import parse_model
+from .utils import get_camelcase
+
+"""
+Code generator
+
+It renders `models_sqla` modules which declare the same classes as `transfer` without parsing django models,
+the module is made by ``manage.py d2a_generate``.
+
+"""
+
+HEADER = '# Generated by `manage.py d2a_generate`. Do not edit it by hand.'
+
+LITERALS = (type(None), bool, int, float, str, bytes)
+
+
+# names defined by the generated code.
+RESERVED = {
+    'OrderedDict', 'apps', 'Column', 'ForeignKey', 'relationship',
+    'declare_attrs', 'get_registry', 'registry', '_table',
+}
+
+
+class Imports(object):
+    """Modules imported by the generated code, they are aliased by the last component of the name."""
+
+    def __init__(self, reserved=()):
+        self.aliases = OrderedDict()
+        self.reserved = RESERVED | set(reserved)
+
+    def alias(self, module):
+        if module in self.aliases:
+            return self.aliases[module]
+        parts = module.split('.')
+        alias = parts[-1]
+        if alias in self.reserved or alias in self.aliases.values():
+            alias = '_'.join(parts)
+        self.aliases[module] = alias
+        return alias
+
+    def render(self):
+        lines, fallbacks = [], []
+        for module, alias in self.aliases.items():
+            package, _, name = module.rpartition('.')
+            suffix = '' if alias == name else ' as {}'.format(alias)
+            if not package:
+                lines.append('import {}'.format(module) + suffix)
+            elif getattr(importlib.import_module(package), name, None) is importlib.import_module(module):
+                lines.append('from {} import {}'.format(package, name) + suffix)
+            else:
+                # the package has another object named the same as the module.
+                fallbacks.append('{} = importlib.import_module({!r})'.format(alias, module))
+        if fallbacks:
+            lines = ['import importlib'] + lines + fallbacks
+        return lines
+
+
+def _locate(value):
+    """It returns the shortest module name which the value can be imported from, or ``None``."""
+    module, qualname = getattr(value, '__module__', None), getattr(value, '__qualname__', '')
+    if not module or '<' in qualname:
+        return None
+    parts = module.split('.')
+    for i in range(1, len(parts) + 1):
+        name = '.'.join(parts[:i])
+        try:
+            obj = importlib.import_module(name)
+            for attr in qualname.split('.'):
+                obj = getattr(obj, attr)
+        except (ImportError, AttributeError):
+            continue
+        if obj is value:
+            return name
+    return None
+
+
+def render_value(value, imports, fallback=None):
+    """It returns python code of the value.
+
+    :param value: literals, containers of them, and importable classes or functions.
+    :param str fallback: code used when the value can't be rendered, otherwise it raises ``ValueError``.
+    """
+    if isinstance(value, LITERALS):
+        return repr(value)
+    if isinstance(value, (list, tuple)):
+        items = [render_value(v, imports, fallback) for v in value]
+        if isinstance(value, tuple):
+            return '({})'.format(', '.join(items) + (',' if len(items) == 1 else ''))
+        return '[{}]'.format(', '.join(items))
+    if isinstance(value, Mapping):
+        return '{{{}}}'.format(', '.join(
+            '{}: {}'.format(render_value(k, imports, fallback), render_value(v, imports, fallback))
+            for k, v in value.items()
+        ))
+    module = _locate(value)
+    if module is not None:
+        return '{}.{}'.format(imports.alias(module), value.__qualname__)
+    if fallback is not None:
+        return fallback
+    raise ValueError('{!r} can not be rendered.'.format(value))
+
+
+def _render_kwargs(kwargs, imports, fallbacks={}):
+    return ['{}={}'.format(k, render_value(v, imports, fallbacks.get(k))) for k, v in kwargs.items()]
+
+
+def _table(name):
+    return '_table({!r})'.format(name)
+
+
+def render_model(django_model, imports, db_type, back_type='backref'):
+    """It returns lines declaring the django model, which is the same as `declare` does."""
+    from . import _column_spec, _extract_kwargs
+
+    model_info = parse_model(django_model)
+    table_name = model_info['table_name']
+    model_ref = 'apps.get_model({!r})'.format(django_model._meta.label)
+
+    attrs = [('__tablename__', repr(table_name))]
+    rel_options = OrderedDict()
+    for name, fields in model_info['fields'].items():
+        rel_option = dict(fields.get('__rel_kwargs__', {}))
+        if rel_option:
+            rel_options[name] = rel_option
+
+        spec = _column_spec(fields, db_type)
+        if spec:
+            col_type, type_kwargs, col_kwargs = spec
+            col_args = ['{}({})'.format(
+                render_value(col_type, imports), ', '.join(_render_kwargs(type_kwargs, imports)))]
+            if '__fk_kwargs__' in fields:
+                col_args.append('ForeignKey({})'.format(', '.join(
+                    _render_kwargs(_extract_kwargs(fields['__fk_kwargs__']), imports))))
+            fallbacks = {}
+            if 'default' in col_kwargs:
+                # defaults which can't be imported (e.g. lambda) are taken from the django field.
+                field_name = _find_field(django_model, name).name
+                fallbacks['default'] = '{}._meta.get_field({!r}).default'.format(model_ref, field_name)
+            col_args.extend(_render_kwargs(col_kwargs, imports, fallbacks))
+            attrs.append((name, 'Column({})'.format(', '.join(col_args))))
+            rel_option['foreign_keys'] = 'lambda: [{}.c[{!r}]]'.format(_table(table_name), name)
+
+    for logical_name, rel_option in rel_options.items():
+        rel_kwargs = OrderedDict()
+        if 'foreign_keys' in rel_option:
+            rel_kwargs['foreign_keys'] = rel_option['foreign_keys']
+        if '__secondary_model__' in rel_option:
+            secondary = _table(rel_option['__secondary_model__']._meta.db_table)
+            target = '{}.c[{!r}]'.format(_table(table_name), rel_option['__target_field__'])
+            rel_kwargs['secondary'] = 'lambda: {}'.format(secondary)
+            rel_kwargs['primaryjoin'] = 'lambda: {} == {}.c[{!r}]'.format(
+                target, secondary, rel_option['__remote_primary_field__'])
+            rel_kwargs['secondaryjoin'] = 'lambda: {} == {}.c[{!r}]'.format(
+                target, secondary, rel_option['__remote_secondary_field__'])
+
+        if '__logical_name__' in rel_option:
+            logical_name = rel_option['__logical_name__']
+
+        for key, value in _extract_kwargs(rel_option).items():
+            if key not in ('foreign_keys', 'secondary', 'primaryjoin', 'secondaryjoin'):
+                rel_kwargs[key] = render_value(value, imports)
+
+        back = rel_option.get('__back__', None)
+        if back and back_type:
+            rel_kwargs[back_type] = repr(back.rstrip('+'))
+
+        rel_args = [repr(rel_option['__target__'])] + ['{}={}'.format(k, v) for k, v in rel_kwargs.items()]
+        attrs.append((logical_name, 'relationship({})'.format(', '.join(rel_args))))
+
+    lines = ['declare_attrs({}, {!r}, OrderedDict(['.format(model_ref, table_name)]
+    lines.extend('    ({!r}, {}),'.format(k, v) for k, v in attrs)
+    lines.append(']), registry)')
+    return lines
+
+
+def _find_field(django_model, attname):
+    for field in django_model._meta.fields:
+        if field.attname == attname:
+            return field
+    return django_model._meta.get_field(attname)
+
+
+def get_models(app_config):
+    """It returns models of the app which are declared, proxy models share the table with the concrete ones."""
+    return [
+        model for model in app_config.get_models(include_auto_created=True)
+        if not model._meta.proxy
+    ]
+
+
+def generate(app_config, db_type, back_type='backref', as_table=False, name_formatter=get_camelcase,
+             database='default'):
+    """It returns source code of the `models_sqla` module of the app.
+
+    Arguments are the same as `transfer` except for `app_config` (``django.apps.AppConfig``).
+    The classes are declared in the registry of `db_type` and `database` (see `d2a.get_registry`).
+    """
+    models = get_models(app_config)
+    names = [name_formatter(model._meta.object_name) for model in models]
+    imports = Imports(reserved=names)
+    body = []
+    for name, model in zip(names, models):
+        lines = render_model(model, imports, db_type, back_type)
+        lines[0] = '{} = {}'.format(name, lines[0])
+        if as_table:
+            lines[-1] += '.__table__'
+        body.extend([''] + lines)
+
+    return '\n'.join([
+        '# coding: utf-8',
+        HEADER,
+        '# db_type: {}'.format(db_type),
+        'from collections import OrderedDict',
+        '',
+        'from django.apps import apps',
+        'from sqlalchemy import Column, ForeignKey',
+        'from sqlalchemy.orm import relationship',
+    ] + imports.render() + [
+        '',
+        'from d2a import declare_attrs, get_registry',
+        '',
+        'registry = get_registry({!r}, {!r})'.format(db_type, database),
+        '',
+        '',
+        'def _table(name):',
+        '    return registry.metadata.tables[name]',
+        '',
+    ] + body) + '\n'
@@ -0,0 +1,260 @@
+# coding: utf-8
+import json
+import sys
+import datetime
+from itertools import chain
+
+from django.core.serializers.json import DjangoJSONEncoder
+from sqlalchemy.sql import sqltypes
+
+from .db import _complement, _get_dialect, logger
+
+"""
+Bulk loaders
+
+:postgresql:
+
+  - https://www.postgresql.org/docs/current/sql-copy.html
+  - https://www.postgresql.org/docs/current/arrays.html#ARRAYS-IO
+  - https://www.postgresql.org/docs/current/rangetypes.html#RANGETYPES-IO
+
+"""
+
+# An unquoted empty string means NULL in csv format, so every other value is quoted.
+NULL = ''
+
+
+def _quote_csv(s):
+    return '"' + s.replace('"', '""') + '"'
+
+
+def _quote_element(s):
+    return '"' + s.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+def _to_text(value):
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    return str(value)
+
+
+def _to_bool(value):
+    return 't' if value else 'f'
+
+
+def _to_bytea(value):
+    return '\\x' + bytes(value).hex()
+
+
+def _to_json(value):
+    return json.dumps(value, cls=DjangoJSONEncoder)
+
+
+def _to_interval(value):
+    if isinstance(value, datetime.timedelta):
+        return '{} days {} seconds {} microseconds'.format(value.days, value.seconds, value.microseconds)
+    return str(value)
+
+
+def _to_hstore(value):
+    return ','.join(
+        '{}=>{}'.format(_quote_element(str(k)), 'NULL' if v is None else _quote_element(str(v)))
+        for k, v in value.items()
+    )
+
+
+def _array_serializer(sa_type):
+    item = serializer(sa_type.item_type)
+
+    def to_array(value):
+        return '{' + ','.join(
+            'NULL' if v is None else to_array(v) if isinstance(v, (list, tuple)) else _quote_element(item(v))
+            for v in value
+        ) + '}'
+    return to_array
+
+
+def _to_range(value):
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (list, tuple)):
+        # (lower, upper) means '[lower,upper)'.
+        lower, upper = value
+        lower_inc, upper_inc = True, False
+    else:
+        # psycopg2.extras.Range
+        if value.isempty:
+            return 'empty'
+        lower, upper = value.lower, value.upper
+        lower_inc, upper_inc = value.lower_inc, value.upper_inc
+    return '{}{},{}{}'.format(
+        '[' if lower_inc else '(',
+        '' if lower is None else _quote_element(_to_text(lower)),
+        '' if upper is None else _quote_element(_to_text(upper)),
+        ']' if upper_inc else ')',
+    )
+
+
+def _geometry_serializer(sa_type):
+    srid = getattr(sa_type, 'srid', -1)
+
+    def to_geometry(value):
+        if hasattr(value, 'ewkt'):
+            # GEOSGeometry of GeoDjango
+            return value.ewkt
+        if hasattr(value, 'desc') and hasattr(value, 'srid'):
+            # WKBElement (desc is hex) or WKTElement of GeoAlchemy2
+            if getattr(value, 'extended', False) or value.srid <= 0:
+                return value.desc
+            return 'SRID={};{}'.format(value.srid, value.desc)
+        text = getattr(value, 'wkt', value)  # shapely geometry or str
+        if srid > 0 and not str(text).upper().startswith('SRID='):
+            return 'SRID={};{}'.format(srid, text)
+        return str(text)
+    return to_geometry
+
+
+# sqlalchemy type class -> function(sqlalchemy type) returning a function converting value to text.
+SERIALIZERS = {
+    sqltypes.ARRAY: _array_serializer,
+    sqltypes.JSON: lambda t: _to_json,
+    sqltypes._Binary: lambda t: _to_bytea,
+    sqltypes.Boolean: lambda t: _to_bool,
+    sqltypes.Date: lambda t: _to_text,
+    sqltypes.DateTime: lambda t: _to_text,
+    sqltypes.Time: lambda t: _to_text,
+    sqltypes._AbstractInterval: lambda t: _to_interval,
+}
+
+
+def _load_postgres_serializers():
+    from sqlalchemy.dialects import postgresql as postgresql_types
+    SERIALIZERS[postgresql_types.HSTORE] = lambda t: _to_hstore
+    SERIALIZERS[postgresql_types.ranges.RangeOperators] = lambda t: _to_range
+
+
+def _load_geoalchemy2_serializers():
+    from geoalchemy2 import types as geotypes
+    SERIALIZERS[geotypes._GISType] = _geometry_serializer
+
+
+# module of optional types -> function adding their serializers, it is called once the module is imported.
+_optional_serializers = {
+    'sqlalchemy.dialects.postgresql': _load_postgres_serializers,
+    'geoalchemy2.types': _load_geoalchemy2_serializers,
+}
+
+
+def serializer(sa_type):
+    """It returns a function converting a value into the text representation of the column type.
+
+    :param sqlalchemy.types.TypeEngine sa_type: Column type (instance or class).
+    """
+    for module in [m for m in list(_optional_serializers) if m in sys.modules]:
+        load = _optional_serializers.pop(module, None)
+        if load is not None:
+            load()
+    sa_type = sa_type() if isinstance(sa_type, type) else sa_type
+    for cls in type(sa_type).__mro__:
+        if cls in SERIALIZERS:
+            return SERIALIZERS[cls](sa_type)
+    return _to_text
+
+
+class CopyReader(object):
+    """File-like object reading csv lines lazily, given to ``cursor.copy_expert``.
+    """
+
+    def __init__(self, lines):
+        self._lines = iter(lines)
+        self._buffer = ''
+
+    def read(self, size=-1):
+        parts, length = [self._buffer], len(self._buffer)
+        while size < 0 or length < size:
+            line = next(self._lines, None)
+            if line is None:
+                break
+            parts.append(line)
+            length += len(line)
+        data = ''.join(parts)
+        if size < 0:
+            self._buffer = ''
+            return data
+        self._buffer = data[size:]
+        return data[:size]
+
+
+def _default_factory(default):
+    if default.is_callable:
+        return lambda: default.arg(None)
+    return lambda: default.arg
+
+
+def _resolve_columns(table, rows, columns):
+    """It returns target columns, rows and functions filling omitted columns having python-side defaults."""
+    first = next(rows, None)
+    if first is None:
+        return [], rows, {}
+    rows = chain([first], rows)
+    if columns is None:
+        if not isinstance(first, dict):
+            return list(table.columns), rows, {}
+        columns = list(first)
+
+    columns = [table.c[c] if not hasattr(c, 'table') else c for c in columns]
+    keys = {c.key for c in columns}
+    defaults = {}
+    for c in table.columns:
+        default = c.default
+        if c.key in keys or default is None or default.is_sequence or default.is_clause_element:
+            continue
+        defaults[c.key] = _default_factory(default)
+        columns.append(c)
+    return columns, rows, defaults
+
+
+def _csv_lines(columns, rows, defaults):
+    serializers = [serializer(c.type) for c in columns]
+    keys = [c.key for c in columns]
+    for row in rows:
+        if isinstance(row, dict):
+            values = [row[k] if k in row else defaults[k]() if k in defaults else None for k in keys]
+        else:
+            values = list(row) + [defaults[k]() for k in keys[len(row):]]
+        yield ','.join(
+            NULL if v is None else _quote_csv(to_text(v))
+            for to_text, v in zip(serializers, values)
+        ) + '\n'
+
+
+def copy_rows(table, rows, columns=None, conn=None, database='default'):
+    """It loads rows into the table through `COPY ... FROM STDIN` (PostgreSQL only), and returns num of records.
+
+    :param table: SQLAlchemy ``Table`` or declarative class, for example made by `transfer` or `declare`.
+    :param rows: Iterable of dict or tuple, it is consumed lazily.
+    :param list columns: Column names (or columns) of the rows.
+      If omitted this option, keys of the first dict or all columns of the table (tuple) are used.
+      Omitted columns having python-side defaults are filled automatically.
+    """
+    table = getattr(table, '__table__', table)
+    conn, dialect = _complement(conn, 'postgresql', database)
+    if conn.vendor != 'postgresql':
+        raise ValueError('copy_rows supports only postgresql, but got {}.'.format(conn.vendor))
+
+    columns, rows, defaults = _resolve_columns(table, iter(rows), columns)
+    if not columns:
+        return 0
+
+    preparer = _get_dialect(dialect).identifier_preparer
+    sql = 'COPY {} ({}) FROM STDIN WITH (FORMAT csv)'.format(
+        preparer.format_table(table),
+        ', '.join(preparer.format_column(c) for c in columns),
+    )
+    with conn.cursor() as cursor:
+        try:
+            cursor.cursor.copy_expert(sql, CopyReader(_csv_lines(columns, rows, defaults)))
+        except Exception:
+            logger.exception('sql:%s', sql)
+            raise
+        return cursor.rowcount
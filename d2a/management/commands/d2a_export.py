@@ -0,0 +1,44 @@
+# coding: utf-8
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.module_loading import import_string
+from sqlalchemy import select
+
+
+class Command(BaseCommand):
+    help = 'Exports a table or a select statement into a Parquet or Feather file.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('source', help='"app_label.ModelName" or dotted path to a select statement.')
+        parser.add_argument('path', help='Output file (.parquet, .feather or .arrow).')
+        parser.add_argument('--columns', help='Comma separated columns exported from the model.')
+        parser.add_argument('--format', choices=['parquet', 'feather'], help='Detected from the path if omitted.')
+        parser.add_argument('--batch-size', type=int, default=10000, help='Number of rows fetched and written at once.')
+        parser.add_argument('--database', default='default', help='Django database.')
+
+    def get_statement(self, source, columns, database='default'):
+        try:
+            model = apps.get_model(source)
+        except (LookupError, ValueError):
+            try:
+                return import_string(source)
+            except ImportError as e:
+                raise CommandError('{} is neither a model nor a statement: {}'.format(source, e))
+
+        from d2a import declare_table
+        from d2a.db import _detect_db_type
+        # the table of the dialect of the database exported from.
+        table = declare_table(model, db_type=_detect_db_type(database), database=database)
+        if not columns:
+            return select([table])
+        try:
+            return select([table.c[c.strip()] for c in columns.split(',')])
+        except KeyError as e:
+            raise CommandError('Unknown column: {}'.format(e))
+
+    def handle(self, *args, **options):
+        from d2a.exports import export_query
+        stmt = self.get_statement(options['source'], options['columns'], options['database'])
+        total = export_query(stmt, options['path'], format=options['format'],
+                             batch_size=options['batch_size'], database=options['database'])
+        self.stdout.write('Exported {} rows into {}.'.format(total, options['path']))
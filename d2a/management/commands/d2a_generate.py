@@ -0,0 +1,66 @@
+# coding: utf-8
+import os
+import site
+import sys
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+
+def _third_party(path):
+    dirs = [d for d in sys.path if os.path.basename(d) in ('site-packages', 'dist-packages')]
+    if hasattr(site, 'getsitepackages'):
+        dirs.extend(site.getsitepackages())
+    return any(path.startswith(os.path.join(d, '')) for d in dirs)
+
+
+class Command(BaseCommand):
+    help = 'Generates `models_sqla` modules so that models are imported instead of converted at startup.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('app_labels', nargs='*', help='Apps to generate. If omitted, apps outside site-packages.')
+        parser.add_argument('--db-type', help='Database type. If omitted, the AUTOLOAD option or django settings.')
+        parser.add_argument('--check', action='store_true',
+                            help='Exits with non-zero status if some modules are stale.')
+
+    def get_app_configs(self, app_labels):
+        if not app_labels:
+            return [a for a in apps.get_app_configs() if a.models_module and not _third_party(a.path)]
+        try:
+            return [apps.get_app_config(label) for label in app_labels]
+        except LookupError as e:
+            raise CommandError(e)
+
+    def handle(self, *args, **options):
+        from d2a import D2A_CONFIG, AUTO_DETECTED_DB_TYPE
+        from d2a.generator import HEADER, generate
+
+        config = D2A_CONFIG.get('AUTOLOAD', {})
+        option = dict(config.get('option', {}))
+        option['db_type'] = options['db_type'] or option.get('db_type', AUTO_DETECTED_DB_TYPE)
+        module = config.get('module', 'models_sqla')
+
+        stale = []
+        for app_config in self.get_app_configs(options['app_labels']):
+            # next to `models`, which may be a package, as `autoload` imports it.
+            path = os.path.join(app_config.path, '{}.py'.format(module))
+            current = None
+            if os.path.exists(path):
+                with open(path) as f:
+                    current = f.read()
+                if HEADER not in current:
+                    self.stderr.write('Skipped {}, it is not generated by d2a_generate.'.format(path))
+                    continue
+
+            source = generate(app_config, **option)
+            if source == current:
+                continue
+            if options['check']:
+                stale.append(path)
+                continue
+            with open(path, 'w') as f:
+                f.write(source)
+            self.stdout.write('Generated {}'.format(path))
+
+        if stale:
+            raise CommandError('Stale modules, run "manage.py d2a_generate":\n{}'.format('\n'.join(stale)))
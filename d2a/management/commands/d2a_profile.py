@@ -0,0 +1,36 @@
+# coding: utf-8
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = 'Converts models from scratch and reports time and memory per app, model and field type.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('app_labels', nargs='*', help='Apps to convert. If omitted, all apps.')
+        parser.add_argument('--db-type', help='Database type. If omitted, the AUTOLOAD option or django settings.')
+        parser.add_argument('--sort', choices=['seconds', 'bytes'], default='seconds', help='Sort key of the report.')
+        parser.add_argument('--limit', type=int, default=20, help='Max num of rows per section.')
+        parser.add_argument('--output', help='Writes the whole report into the file as JSON.')
+        parser.add_argument('--no-memory', action='store_true', help='Does not trace memory, which makes it slow.')
+
+    def handle(self, *args, **options):
+        from d2a import D2A_CONFIG
+        from d2a.profiling import profile_apps
+
+        try:
+            app_configs = [apps.get_app_config(label) for label in options['app_labels']] or apps.get_app_configs()
+        except LookupError as e:
+            raise CommandError(e)
+
+        option = dict(D2A_CONFIG.get('AUTOLOAD', {}).get('option', {}))
+        for key in ('as_table', 'name_formatter'):
+            option.pop(key, None)
+        if options['db_type']:
+            option['db_type'] = options['db_type']
+
+        profiler = profile_apps(app_configs, trace_memory=not options['no_memory'], **option)
+        self.stdout.write(profiler.format(sort=options['sort'], limit=options['limit']))
+        if options['output']:
+            profiler.dump(options['output'], sort=options['sort'])
+            self.stdout.write('Exported the report into {}.'.format(options['output']))
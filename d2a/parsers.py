@@ -1,16 +1,19 @@
 # coding: utf-8
 import logging
 import warnings
+import weakref
 from collections import OrderedDict
+from collections.abc import Mapping
 
 
 from django.db.models.base import ModelBase
 from django.db.models.fields import NOT_PROVIDED
 from django.db import models
 
-from .fields import mapping
+from .fields import mapping, resolve
 from .compat import M2MField
 from .missing import fallback
+from . import profiling
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +25,77 @@ def get_m2m_fields(model):
     }
 
 
+def get_dependencies(model):
+    """It returns models which the model refers to,
+    by foreign keys and many-to-many fields (and the intermediate models).
+    """
+    dependencies = []
+    for field in model._meta.fields:
+        if field.is_relation and isinstance(field.related_model, ModelBase):
+            dependencies.append(field.related_model)
+
+    for field in get_m2m_fields(model).values():
+        if not field.reverse:
+            dependencies.extend([field.rel.through, field.rel.model])
+    return [m for m in OrderedDict.fromkeys(dependencies) if m is not model]
+
+
+# keys of field info -> index of the values, shared by `FieldInfo` having the same keys.
+# the keys are names of the info, so it doesn't grow with models.
+_indexes = {}
+# items of nested dict -> `FieldInfo`, e.g. kwargs of types are shared by fields.
+# the items may have models (e.g. intermediate models), an entry is dropped with the last info using it,
+# so that models reloaded or declared again by `redeclare` are not kept.
+_nested = weakref.WeakValueDictionary()
+
+
+class FieldInfo(Mapping):
+    """Read-only mapping of the result of `parse_field`, `parse_model` makes it.
+
+    It is smaller than dict, because fields which have the same keys share the index of the keys
+    and the values are kept in a tuple. Nested dicts also become `FieldInfo`, shared by equal ones.
+    """
+    __slots__ = ('_index', '_values', '__weakref__')
+
+    def __init__(self, info):
+        keys = tuple(info)
+        index = _indexes.get(keys)
+        if index is None:
+            index = _indexes.setdefault(keys, {key: i for i, key in enumerate(keys)})
+        self._index = index
+        self._values = tuple([_freeze(v) if type(v) is dict else v for v in info.values()])
+
+    def __getitem__(self, key):
+        return self._values[self._index[key]]
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __contains__(self, key):
+        return key in self._index
+
+    def get(self, key, default=None):
+        i = self._index.get(key)
+        return default if i is None else self._values[i]
+
+    def __repr__(self):
+        return 'FieldInfo({!r})'.format(dict(self.items()))
+
+
+def _freeze(info):
+    try:
+        # types are compared too, `1 == True`.
+        key = tuple([(k, type(v), v) for k, v in info.items()])
+        return _nested[key]
+    except KeyError:
+        return _nested.setdefault(key, FieldInfo(info))
+    except TypeError:
+        return FieldInfo(info)
+
+
 def parse_field(field):
     info = {}
     field_type = type(field)
@@ -37,10 +111,9 @@ def parse_field(field):
     if getattr(field, 'default', NOT_PROVIDED) is not NOT_PROVIDED:
         info['default'] = field.default
 
-    try:
-        conf = mapping[field_type]
-    except KeyError as e:
-        alt = fallback(field_type, e)
+    conf = resolve(field_type)
+    if conf is None:
+        alt = fallback(field_type, KeyError(field_type))
         conf = mapping.get(alt, {})
     
     info.update(conf)
@@ -53,13 +126,23 @@ def parse_field(field):
 
 
 def parse_model(model, callback=parse_field):
+    with profiling.measure('parse', model):
+        return _parse_model(model, callback)
+
+
+def _parse_field(callback, field):
+    with profiling.measure('field', type(field)):
+        return FieldInfo(callback(field))
+
+
+def _parse_model(model, callback):
     info = {'table_name': model._meta.db_table, 'fields': OrderedDict()}
     for field in model._meta.fields:
-        info['fields'][field.attname] = callback(field)
+        info['fields'][field.attname] = _parse_field(callback, field)
 
     for name, field in get_m2m_fields(model).items():
         try:
-            info['fields'][name] = callback(field)
+            info['fields'][name] = _parse_field(callback, field)
         except AttributeError as e:
             # it raises an attribute exception when AUTH_USER_MODEL is changed.
             from django.contrib.auth import get_user_model, models as auth_models
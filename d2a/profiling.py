@@ -0,0 +1,222 @@
+# coding: utf-8
+import json
+import time
+import tracemalloc
+from collections import OrderedDict
+
+from sqlalchemy import event
+from sqlalchemy.orm import Mapper, configure_mappers
+
+"""
+Conversion profiler
+
+It records wall time and memory allocated (net of `tracemalloc`) while converting models.
+
+:parse: `parse_model` per django model, including its fields.
+:field: callbacks of `parse_model` per field type.
+:declare: `declare` per django model except for parsing, that includes making ``Table`` and ``Mapper``.
+:mapper: configuring the mapper per django model (``sqlalchemy.orm.configure_mappers``).
+
+"""
+
+KINDS = ('parse', 'field', 'declare', 'mapper')
+
+# the profiler which is recording, `start` sets it.
+current = None
+
+
+class _NullMeasure(object):
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_null = _NullMeasure()
+
+
+class _Measure(object):
+    def __init__(self, profiler, kind, key):
+        self.profiler, self.kind, self.key = profiler, kind, key
+
+    def __enter__(self):
+        self.memory = _traced_memory()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profiler.add(self.kind, self.key, time.perf_counter() - self.start, _traced_memory() - self.memory)
+        return False
+
+
+def _traced_memory():
+    return tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0
+
+
+def _name(key):
+    meta = getattr(key, '_meta', None)
+    if meta is not None:
+        return meta.label
+    if isinstance(key, type):
+        return '{}.{}'.format(key.__module__, key.__qualname__)
+    return str(key)
+
+
+class Profiler(object):
+    """It accumulates calls, seconds and bytes per kind and key (django model or field type)."""
+
+    def __init__(self):
+        self.records = OrderedDict((kind, OrderedDict()) for kind in KINDS)
+        self._mappers = {}
+        self._models = {}
+
+    def add(self, kind, key, seconds, size):
+        record = self.records[kind].setdefault(key, [0, 0.0, 0])
+        record[0] += 1
+        record[1] += seconds
+        record[2] += size
+
+    def measure(self, kind, key):
+        return _Measure(self, kind, key)
+
+    def _before_mapper_configured(self, mapper, cls):
+        django_model = self._django_model(cls)
+        if django_model is not None:
+            # the others are not declared by d2a.
+            self._mappers[mapper] = _Measure(self, 'mapper', django_model).__enter__()
+
+    def _mapper_configured(self, mapper, cls):
+        measure = self._mappers.pop(mapper, None)
+        if measure is not None:
+            measure.__exit__(None, None, None)
+
+    def _django_model(self, cls):
+        if cls not in self._models:
+            from . import registries
+            self._models = {v: k for registry in list(registries.values()) for k, v in registry.existing.items()}
+        return self._models.get(cls)
+
+    def report(self, sort='seconds'):
+        """It returns rows (dict) per section, `app`, `model` and `field`, sorted by `seconds` or `bytes` descending.
+
+        Rows of `app` and `model` are the sum of `parse`, `declare` and `mapper`.
+        """
+        apps, models = OrderedDict(), OrderedDict()
+        for kind in ('parse', 'declare', 'mapper'):
+            for key, (calls, seconds, size) in self.records[kind].items():
+                row = models.setdefault(key, OrderedDict([
+                    ('name', _name(key)),
+                    ('parse', 0.0), ('declare', 0.0), ('mapper', 0.0), ('seconds', 0.0), ('bytes', 0),
+                ]))
+                row[kind] += seconds
+                row['seconds'] += seconds
+                row['bytes'] += size
+
+                app_label = getattr(getattr(key, '_meta', None), 'app_label', '-')
+                app = apps.setdefault(app_label, OrderedDict([
+                    ('name', app_label), ('models', 0), ('seconds', 0.0), ('bytes', 0),
+                ]))
+                app['seconds'] += seconds
+                app['bytes'] += size
+        for key in models:
+            app_label = getattr(getattr(key, '_meta', None), 'app_label', '-')
+            apps[app_label]['models'] += 1
+
+        fields = [
+            OrderedDict([('name', _name(key)), ('calls', calls), ('seconds', seconds), ('bytes', size)])
+            for key, (calls, seconds, size) in self.records['field'].items()
+        ]
+        return OrderedDict(
+            (section, sorted(rows, key=lambda row: row[sort], reverse=True))
+            for section, rows in [('app', list(apps.values())), ('model', list(models.values())), ('field', fields)]
+        )
+
+    def format(self, sort='seconds', limit=20):
+        """It returns the report as text, each section has `limit` rows at most."""
+        lines = []
+        for section, rows in self.report(sort).items():
+            if not rows:
+                continue
+            columns = [c for c in rows[0] if c != 'name']
+            lines.append('{:<60}'.format(section) + ''.join('{:>12}'.format(c) for c in columns))
+            for row in rows[:limit]:
+                lines.append('{:<60}'.format(row['name'][:59]) + ''.join(
+                    '{:>12}'.format(_format_value(c, row[c])) for c in columns))
+            lines.append('')
+        return '\n'.join(lines)
+
+    def dump(self, path, sort='seconds'):
+        """It writes the report into the path as JSON."""
+        with open(path, 'w') as f:
+            json.dump(self.report(sort), f, indent=2)
+
+
+def _format_value(column, value):
+    if column == 'bytes':
+        return '{:.1f}KiB'.format(value / 1024)
+    if isinstance(value, float):
+        return '{:.2f}ms'.format(value * 1000)
+    return str(value)
+
+
+def measure(kind, key):
+    """It returns a context manager recording the block into the current profiler, it does nothing unless profiling."""
+    if current is None:
+        return _null
+    return current.measure(kind, key)
+
+
+def start(trace_memory=True):
+    """It starts profiling and returns the `Profiler`."""
+    global current
+    if current is not None:
+        return current
+    profiler = Profiler()
+    profiler.traces_memory = trace_memory and not tracemalloc.is_tracing()
+    if profiler.traces_memory:
+        tracemalloc.start()
+    event.listen(Mapper, 'before_mapper_configured', profiler._before_mapper_configured)
+    event.listen(Mapper, 'mapper_configured', profiler._mapper_configured)
+    current = profiler
+    return profiler
+
+
+def stop():
+    """It stops profiling and returns the `Profiler` (or ``None`` unless profiling)."""
+    global current
+    profiler, current = current, None
+    if profiler is None:
+        return None
+    event.remove(Mapper, 'before_mapper_configured', profiler._before_mapper_configured)
+    event.remove(Mapper, 'mapper_configured', profiler._mapper_configured)
+    if profiler.traces_memory:
+        tracemalloc.stop()
+    return profiler
+
+
+def profile_apps(app_configs, trace_memory=True, **options):
+    """It converts models of the apps from scratch, and returns the `Profiler`.
+
+    Models are parsed again and declared in a temporary `Registry`, so the models declared so far are kept.
+
+    :param app_configs: ``django.apps.AppConfig`` objects.
+    :param options: Arguments of `transfer_all`.
+    """
+    import d2a
+
+    key = (options.get('db_type', d2a.AUTO_DETECTED_DB_TYPE), options.get('database', 'default'))
+    saved_registry, saved_infos = d2a.registries.get(key), d2a._model_infos
+    d2a.registries[key], d2a._model_infos = d2a.Registry(*key), {}
+    profiler = start(trace_memory)
+    try:
+        d2a.transfer_all([(a.models_module, {}) for a in app_configs if a.models_module], **options)
+        configure_mappers()
+    finally:
+        stop()
+        d2a._model_infos = saved_infos
+        if saved_registry is None:
+            del d2a.registries[key]
+        else:
+            d2a.registries[key] = saved_registry
+    return profiler
@@ -5,6 +5,7 @@ from sqlalchemy import (
     delete,
     update,
     func,
+    bindparam,
 )
 
 @pytest.fixture(scope='function')
@@ -55,6 +56,42 @@ class Test_query_expression:
         assert actual == expected
 
 
+@pytest.mark.django_db
+class Test_stream_expression:
+    def _callFUT(self, stmt, **kwargs):
+        from d2a.db import stream_expression
+        return stream_expression(stmt, **kwargs)
+
+    def test_stream_expression(self, author_table, author_a, author_b):
+        stmt = select([
+            author_table.c.id,
+            author_table.c.name,
+        ]).select_from(author_table).order_by(author_table.c.age)
+        with self._callFUT(stmt, chunk_size=1) as rows:
+            actual = list(rows)
+        expected = [
+            {'id': author_b.id, 'name': author_b.name},
+            {'id': author_a.id, 'name': author_a.name},
+        ]
+        assert actual == expected
+
+    def test_stream_expression_as_tuple(self, author_table, author_a, author_b):
+        stmt = select([
+            author_table.c.name,
+        ]).select_from(author_table).order_by(author_table.c.age)
+        with self._callFUT(stmt, as_col_dict=False) as rows:
+            actual = list(rows)
+        assert actual == [(author_b.name,), (author_a.name,)]
+
+    def test_error(self, author_table):
+        from django.db.utils import ProgrammingError
+        stmt = select([func.no_such_function(author_table.c.name)])
+        # the error of the statement, not of fetching from the cursor.
+        with pytest.raises(ProgrammingError, match='no_such_function'):
+            with self._callFUT(stmt) as rows:
+                list(rows)
+
+
 @pytest.mark.django_db
 class Test_execute_expression:
     def _callFUT(self, stmt):
@@ -95,6 +132,36 @@ class Test_execute_expression:
         assert actual == expected
 
 
+@pytest.mark.django_db
+class Test_execute_many:
+    def _callFUT(self, stmt, rows, **kwargs):
+        from d2a.db import execute_many
+        return execute_many(stmt, rows, **kwargs)
+
+    def test_insert_many(self, author_table, authors):
+        expected = [
+            {'name': 'a', 'age': 10},
+            {'name': 'b', 'age': 20},
+            {'name': 'c', 'age': 30},
+        ]
+        assert self._callFUT(insert(author_table), expected, batch_size=2) == 3
+        actual = list(authors.values('name', 'age'))
+        assert actual == expected
+
+    def test_update_many(self, author_table, author_a, author_b, authors):
+        stmt = update(author_table).where(author_table.c.id == bindparam('b_id')).values(age=bindparam('b_age'))
+        rows = [
+            {'b_id': author_a.id, 'b_age': 1},
+            {'b_id': author_b.id, 'b_age': 2},
+        ]
+        assert self._callFUT(stmt, rows) == 2
+        actual = list(authors.values('name', 'age'))
+        expected = [
+            {'name': 'a', 'age': 1},
+            {'name': 'b', 'age': 2},
+        ]
+        assert actual == expected
+
 
 class Test_make_session:
     def _callFUT(self, **kwargs):
@@ -5,6 +5,7 @@ from sqlalchemy import (
     delete,
     update,
     func,
+    bindparam,
 )
 
 
@@ -56,6 +57,106 @@ class Test_query_expression:
         assert actual == expected
 
 
+@pytest.mark.django_db
+class Test_stream_expression:
+    def _callFUT(self, stmt, **kwargs):
+        from d2a.db import stream_expression
+        return stream_expression(stmt, **kwargs)
+
+    def test_stream_expression(self, author_table, author_a, author_b):
+        stmt = select([
+            author_table.c.id,
+            author_table.c.name,
+        ]).select_from(author_table).order_by(author_table.c.age)
+        with self._callFUT(stmt, chunk_size=1) as rows:
+            actual = list(rows)
+        expected = [
+            {'id': author_b.id, 'name': author_b.name},
+            {'id': author_a.id, 'name': author_a.name},
+        ]
+        assert actual == expected
+
+    def test_stream_expression_as_tuple(self, author_table, author_a, author_b):
+        stmt = select([
+            author_table.c.name,
+        ]).select_from(author_table).order_by(author_table.c.age)
+        with self._callFUT(stmt, as_col_dict=False) as rows:
+            actual = list(rows)
+        assert actual == [(author_b.name,), (author_a.name,)]
+
+    def test_error(self, author_table):
+        from django.db.utils import ProgrammingError
+        stmt = select([func.no_such_function(author_table.c.name)])
+        # the error of the statement, not of fetching from the cursor.
+        with pytest.raises(ProgrammingError, match='no_such_function'):
+            with self._callFUT(stmt) as rows:
+                list(rows)
+
+
+# statements run on connections of worker threads, so that the data must be committed.
+@pytest.mark.django_db(transaction=True)
+class Test_query_many:
+    def _callFUT(self, stmts, **kwargs):
+        from d2a.db import query_many
+        return query_many(stmts, **kwargs)
+
+    def test_query_many(self, author_table, author_a, author_b):
+        stmts = [
+            select([func.count()]).select_from(author_table),
+            select([func.max(author_table.c.age).label('age')]),
+            select([author_table.c.name]).where(author_table.c.age < 0),
+        ]
+        results = self._callFUT(stmts, max_workers=2, as_col_dict=False)
+        assert [r.result for r in results] == [[(2,)], [(author_a.age,)], []]
+        assert all(r.error is None and r.elapsed > 0 for r in results)
+
+    def test_query_many_error(self, author_table):
+        stmts = [
+            select([func.count()]).select_from(author_table),
+            select([author_table.c.name]).where(func.no_such_function(author_table.c.age)),
+        ]
+        results = self._callFUT(stmts)
+        assert results[0].result == [(0,)]
+        assert results[1].result is None and results[1].error is not None
+
+
+def _run(coroutine):
+    import asyncio
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+# coroutines run in another thread, so that the data must be committed.
+@pytest.mark.django_db(transaction=True)
+class Test_async_expression:
+    def test_async_query_expression(self, author_table, author_a, author_b):
+        from d2a.db import async_query_expression
+        stmt = select([
+            author_table.c.name,
+        ]).select_from(author_table).order_by(author_table.c.age)
+        actual = _run(async_query_expression(stmt))
+        assert actual == [{'name': author_b.name}, {'name': author_a.name}]
+
+    def test_async_stream_expression(self, author_table, author_a, author_b):
+        from d2a.db import async_stream_expression
+        stmt = select([
+            author_table.c.name,
+        ]).select_from(author_table).order_by(author_table.c.age)
+
+        async def consume():
+            async with async_stream_expression(stmt, as_col_dict=False, chunk_size=1) as rows:
+                return [row async for row in rows]
+        assert _run(consume()) == [(author_b.name,), (author_a.name,)]
+
+    def test_async_execute_expression(self, author_table, authors):
+        from d2a.db import async_execute_expression
+        stmt = insert(author_table).values([{'name': 'a', 'age': 10}, {'name': 'b', 'age': 20}])
+        assert _run(async_execute_expression(stmt)) == 2
+
+
 @pytest.mark.django_db
 class Test_execute_expression:
     def _callFUT(self, stmt):
@@ -96,6 +197,81 @@ class Test_execute_expression:
         assert actual == expected
 
 
+@pytest.mark.django_db
+class Test_execute_many:
+    def _callFUT(self, stmt, rows, **kwargs):
+        from d2a.db import execute_many
+        return execute_many(stmt, rows, **kwargs)
+
+    def test_insert_many(self, author_table, authors):
+        expected = [
+            {'name': 'a', 'age': 10},
+            {'name': 'b', 'age': 20},
+            {'name': 'c', 'age': 30},
+        ]
+        assert self._callFUT(insert(author_table), expected, batch_size=2) == 3
+        actual = list(authors.values('name', 'age'))
+        assert actual == expected
+
+    def test_update_many(self, author_table, author_a, author_b, authors):
+        stmt = update(author_table).where(author_table.c.id == bindparam('b_id')).values(age=bindparam('b_age'))
+        rows = [
+            {'b_id': author_a.id, 'b_age': 1},
+            {'b_id': author_b.id, 'b_age': 2},
+        ]
+        assert self._callFUT(stmt, rows) == 2
+        actual = list(authors.values('name', 'age'))
+        expected = [
+            {'name': 'a', 'age': 1},
+            {'name': 'b', 'age': 2},
+        ]
+        assert actual == expected
+
+
+@pytest.mark.django_db
+class Test_copy_rows:
+    def _callFUT(self, table, rows, **kwargs):
+        from d2a.loaders import copy_rows
+        return copy_rows(table, rows, **kwargs)
+
+    def test_copy_rows(self, author_table, authors):
+        expected = [
+            {'name': 'a', 'age': 10},
+            {'name': 'b "quoted"', 'age': 20},
+        ]
+        assert self._callFUT(author_table, iter(expected)) == 2
+        actual = list(authors.values('name', 'age'))
+        assert actual == expected
+
+    def test_copy_rows_with_defaults(self, author_a):
+        from books.models import Book
+        from books.models_sqla import Book as BookModel
+        rows = [
+            ('x', {'yen': 100}, author_a.id, b'\x00', ['a', 'b,c']),
+            ('y', {'yen': 200}, None, b'', []),
+        ]
+        columns = ['title', 'price', 'author_id', 'content', 'tags']
+        assert self._callFUT(BookModel, rows, columns=columns) == 2
+        actual = list(Book.objects.order_by('title').values('title', 'price', 'author_id', 'tags'))
+        expected = [
+            {'title': 'x', 'price': {'yen': 100}, 'author_id': author_a.id, 'tags': ['a', 'b,c']},
+            {'title': 'y', 'price': {'yen': 200}, 'author_id': None, 'tags': []},
+        ]
+        assert actual == expected
+
+
+@pytest.mark.django_db
+class Test_frame:
+    def test_write_and_read_frame(self, author_table, authors):
+        import pandas as pd
+        from d2a.frames import read_frame, write_frame
+        df = pd.DataFrame({'name': ['a', 'b'], 'age': [10, 20]})
+        assert write_frame(df, author_table) == 2
+        actual = read_frame(select([author_table.c.name, author_table.c.age]).order_by(author_table.c.age))
+        assert actual.to_dict('records') == [{'name': 'a', 'age': 10}, {'name': 'b', 'age': 20}]
+        assert str(actual['age'].dtype) == 'int64'
+
+
 @pytest.mark.skip
 class Test_make_session:
     def _callFUT(self, **kwargs):
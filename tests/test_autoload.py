@@ -0,0 +1,380 @@
+import pytest
+
+
+class TestLazyModule(object):
+    def _makeOne(self, models, **kwargs):
+        from d2a import LazyModule
+        return LazyModule('auth_models_sqla', models, db_type='postgresql', **kwargs)
+
+    @pytest.fixture()
+    def models(self):
+        from django.contrib.auth import models
+        return models
+
+    def test_declared_on_access(self, models):
+        from d2a import existing
+        module = self._makeOne(models)
+        assert {'User', 'Group', 'Permission'} <= set(module.__all__) <= set(dir(module))
+        user = module.User
+        assert existing[models.User] is user
+        # the models which it refers to are also declared.
+        assert models.Group in existing and models.Permission in existing
+        assert module.__dict__['User'] is user
+
+    def test_as_table(self, models):
+        module = self._makeOne(models, as_table=True)
+        assert module.Group.name == 'auth_group'
+
+    def test_intermediate_models(self, models):
+        from d2a import existing
+        module = self._makeOne(models)
+        assert {'UserGroups', 'UserUserPermissions', 'GroupPermissions'} <= set(module.__all__)
+        assert module.UserGroups is existing[models.User.groups.through]
+
+    def test_missing(self, models):
+        module = self._makeOne(models)
+        with pytest.raises(AttributeError):
+            module.Nothing
+
+
+class Test_declare(object):
+    def _callFUT(self, model):
+        from d2a import declare
+        return declare(model, db_type='postgresql')
+
+    def test_existing_not_parsed(self, monkeypatch):
+        import d2a
+        from django.contrib.contenttypes.models import ContentType
+        declared = self._callFUT(ContentType)
+
+        def parse_model(model):
+            raise AssertionError('parsed again')
+        monkeypatch.setattr(d2a, 'parse_model', parse_model)
+        assert self._callFUT(ContentType) is declared
+
+
+class Test_with_dependencies(object):
+    def _callFUT(self, models):
+        from d2a import _with_dependencies
+        return _with_dependencies(models)
+
+    def test_referred_first(self):
+        from django.contrib.auth.models import User, Group, Permission
+        from django.contrib.contenttypes.models import ContentType
+        result = self._callFUT([User])
+        assert result[-1] is User
+        assert result.index(ContentType) < result.index(Permission) < result.index(Group)
+        assert result.index(User.groups.through) < result.index(User)
+        assert len(result) == len(set(result))
+
+
+class Test_transfer_all(object):
+    def _callFUT(self, modules, **kwargs):
+        from d2a import transfer_all
+        return transfer_all(modules, db_type='postgresql', **kwargs)
+
+    def test_as_table(self):
+        from django.contrib.contenttypes import models as contenttypes_models
+        from d2a import get_registry
+        contenttypes = {}
+        self._callFUT([(contenttypes_models, contenttypes)], as_table=True, database='as_table')
+        assert contenttypes['ContentType'] is get_registry('postgresql', 'as_table').metadata.tables['django_content_type']
+        assert not get_registry('postgresql', 'as_table').existing
+
+
+    def test_exports(self):
+        from django.contrib.auth import models as auth_models
+        from django.contrib.contenttypes import models as contenttypes_models
+        from d2a import existing
+        auth, contenttypes = {}, {}
+        self._callFUT([(auth_models, auth), (contenttypes_models, contenttypes)], workers=2)
+        assert auth['User'] is existing[auth_models.User]
+        assert auth['UserGroups'] is existing[auth_models.User.groups.through]
+        assert list(contenttypes) == ['ContentType']
+
+    def test_parsed_once(self, monkeypatch):
+        import d2a
+        from django.contrib.sessions import models as sessions_models
+        parsed = []
+        parse_model = d2a.parse_model
+
+        def record(model):
+            parsed.append(model)
+            return parse_model(model)
+        monkeypatch.setattr(d2a, 'parse_model', record)
+        self._callFUT([(sessions_models, {})])
+        self._callFUT([(sessions_models, {})])
+        assert parsed == [sessions_models.Session]
+
+
+class Test_transfer(object):
+    def _callFUT(self, models, exports, **kwargs):
+        from d2a import transfer
+        return transfer(models, exports, db_type='postgresql', **kwargs)
+
+    def test_as_table_with_m2m(self):
+        from django.contrib.auth import models as auth_models
+        auth = {}
+        self._callFUT(auth_models, auth, as_table=True, database='transfer_as_table')
+        assert sorted(auth) == ['Group', 'GroupPermissions', 'Permission', 'User', 'UserGroups', 'UserUserPermissions']
+        assert auth['UserGroups'].name == 'auth_user_groups'
+
+
+class Test_select_models(object):
+    def _callFUT(self, models, include=None, exclude=None):
+        from d2a import select_models
+        return select_models(models, include, exclude)
+
+    @pytest.fixture()
+    def models(self):
+        from django.apps import apps
+        return apps.get_models(include_auto_created=True)
+
+    def test_include_with_dependencies(self, models):
+        from django.contrib.admin.models import LogEntry
+        from django.contrib.auth.models import User, Group, Permission
+        from django.contrib.sessions.models import Session
+        result = self._callFUT(models, include=['ADMIN'])
+        assert result[-1] is LogEntry
+        assert {User, Group, Permission, User.groups.through} <= set(result)
+        assert Session not in result
+
+    def test_exclude(self, models):
+        from django.contrib.auth.models import User, Group
+        from django.contrib.contenttypes.models import ContentType
+        result = self._callFUT(models, include=['auth.*'], exclude=['auth.User*', 'contenttypes'])
+        assert User not in result and User.groups.through not in result
+        assert Group in result
+        # referred by Permission.
+        assert ContentType in result
+        assert self._callFUT(models, exclude=['*']) == []
+
+
+class TestAutoload(object):
+    def _callFUT(self, config):
+        from d2a import autoload
+        return autoload(config)
+
+    @pytest.fixture()
+    def module_name(self):
+        import sys
+        yield 'models_sqla_selected'
+        for name in [n for n in sys.modules if n.endswith('.models_sqla_selected')]:
+            del sys.modules[name]
+
+    @pytest.mark.parametrize('lazy', [False, True])
+    def test_include(self, module_name, lazy):
+        import sys
+        from d2a import get_registry
+        from django.contrib.sessions.models import Session
+        from django.contrib.contenttypes.models import ContentType
+        database = 'lazy_selected' if lazy else 'selected'
+        self._callFUT({
+            'module': module_name,
+            'lazy': lazy,
+            'include': ['sessions', 'contenttypes'],
+            'option': {'db_type': 'postgresql', 'database': database},
+        })
+        sessions = sys.modules['django.contrib.sessions.' + module_name]
+        auth = sys.modules['django.contrib.auth.' + module_name]
+        assert sessions.Session is get_registry('postgresql', database).existing[Session]
+        contenttypes = sys.modules['django.contrib.contenttypes.' + module_name]
+        assert not hasattr(auth, 'User')
+        assert contenttypes.ContentType is get_registry('postgresql', database).existing[ContentType]
+        assert set(get_registry('postgresql', database).existing) == {Session, ContentType}
+
+
+class Test_get_registry(object):
+    def _callFUT(self, *args):
+        from d2a import get_registry
+        return get_registry(*args)
+
+    def test_default(self):
+        import d2a
+        registry = self._callFUT()
+        assert registry.Base is d2a.Base
+        assert registry.existing is d2a.existing
+        assert self._callFUT(d2a.AUTO_DETECTED_DB_TYPE, 'default') is registry
+
+    def test_per_db_type_and_database(self):
+        registry = self._callFUT('sqlite3', 'cache')
+        assert self._callFUT('sqlite3', 'cache') is registry
+        assert self._callFUT('sqlite3', 'default') is not registry
+        assert registry.metadata is registry.Base.metadata
+
+
+class Test_declare_registries(object):
+    def _callFUT(self, model, **kwargs):
+        from d2a import declare
+        return declare(model, **kwargs)
+
+    def test_variants_coexist(self, monkeypatch):
+        import d2a
+        from sqlalchemy.dialects import oracle
+        from django.contrib.auth.models import Group
+        pg = self._callFUT(Group, db_type='postgresql')
+
+        def parse_model(model):
+            raise AssertionError('parsed again')
+        monkeypatch.setattr(d2a, 'parse_model', parse_model)
+        for model in d2a._with_dependencies([Group]):
+            self._callFUT(model, db_type='oracle', database='cache')
+        ora = self._callFUT(Group, db_type='oracle', database='cache')
+        assert ora is not pg
+        assert self._callFUT(Group, db_type='oracle', database='cache') is ora
+        assert ora.__table__.metadata is d2a.get_registry('oracle', 'cache').metadata is not pg.__table__.metadata
+        assert isinstance(ora.__table__.c.id.type, oracle.NUMBER)
+        assert not isinstance(pg.__table__.c.id.type, oracle.NUMBER)
+        # m2m relations refer to the tables of the same registry.
+        assert ora.permissions.property.secondary is ora.__table__.metadata.tables['auth_group_permissions']
+
+    def test_back_type_not_leaked(self):
+        from d2a import _with_dependencies
+        from django.contrib.auth.models import Permission
+        self._callFUT(Permission, db_type='postgresql')
+        for model in _with_dependencies([Permission]):
+            self._callFUT(model, db_type='mysql', database='other', back_type=None)
+        plain = self._callFUT(Permission, db_type='mysql', database='other', back_type=None)
+        assert plain.content_type.property.backref is None
+
+
+class Test_declare_table(object):
+    def _callFUT(self, model, **kwargs):
+        from d2a import declare_table
+        return declare_table(model, db_type='postgresql', **kwargs)
+
+    def test_without_orm(self):
+        import d2a
+        from django.contrib.auth.models import Group
+        registry = d2a.get_registry('postgresql', 'core')
+        tables = [self._callFUT(model, database='core') for model in d2a._with_dependencies([Group])]
+        table = self._callFUT(Group, database='core')
+        assert table is tables[-1] is registry.metadata.tables['auth_group']
+        assert table.c.keys() == d2a.declare(Group, db_type='postgresql').__table__.c.keys()
+        assert not registry.existing
+
+    def test_mapped_later(self):
+        import d2a
+        from sqlalchemy.orm import configure_mappers
+        from django.contrib.auth.models import Group
+        models = d2a._with_dependencies([Group])
+        tables = [self._callFUT(model, database='lazy_orm') for model in models]
+        classes = [d2a.declare(model, db_type='postgresql', database='lazy_orm') for model in models]
+        configure_mappers()
+        assert [cls.__table__ for cls in classes] == tables
+        group = classes[-1]
+        assert group.permissions.property.secondary is tables[models.index(Group.permissions.through)]
+
+    def test_declared_first(self):
+        import d2a
+        from django.contrib.contenttypes.models import ContentType
+        content_type = d2a.declare(ContentType, db_type='postgresql', database='orm_first')
+        assert self._callFUT(ContentType, database='orm_first') is content_type.__table__
+
+
+class Test_make_type(object):
+    def _callFUT(self, col_type, type_kwargs):
+        from d2a import _make_type
+        return _make_type(col_type, type_kwargs)
+
+    def test_shared(self):
+        from sqlalchemy import types
+        varchar = self._callFUT(types.VARCHAR, {'length': 30})
+        assert varchar.length == 30
+        assert self._callFUT(types.VARCHAR, {'length': 30}) is varchar
+        assert self._callFUT(types.VARCHAR, {'length': 31}) is not varchar
+
+    def test_not_shared(self):
+        from sqlalchemy import types
+        from sqlalchemy.dialects import postgresql
+        assert self._callFUT(types.BOOLEAN, {}) is not self._callFUT(types.BOOLEAN, {})
+        unhashable = {'item_type': types.INTEGER, 'dimensions': [1]}
+        assert self._callFUT(postgresql.ARRAY, unhashable) is not self._callFUT(postgresql.ARRAY, unhashable)
+
+
+class Test_redeclare(object):
+    def _callFUT(self, **kwargs):
+        from d2a import redeclare
+        return redeclare(db_type='postgresql', database=self.database, **kwargs)
+
+    def _make_models(self):
+        import warnings
+        from collections import OrderedDict
+        from django.db import models
+
+        def make(class_name, **fields):
+            attrs = OrderedDict([('__module__', __name__), ('Meta', type('Meta', (), {'app_label': 'redeclare'}))])
+            attrs.update(fields)
+            return type(class_name, (models.Model,), attrs)
+
+        with warnings.catch_warnings():
+            # "Model was already registered", as reloaded.
+            warnings.simplefilter('ignore', RuntimeWarning)
+            author = make('Author', name=models.CharField(max_length=10))
+            book = make('Book', author=models.ForeignKey(author, on_delete=models.CASCADE))
+            review = make('Review', book=models.ForeignKey(book, on_delete=models.CASCADE))
+            tag = make('Tag', name=models.CharField(max_length=10))
+        return author, book, review, tag
+
+    @pytest.fixture()
+    def declared(self, request):
+        from sqlalchemy.orm import configure_mappers
+        from d2a import declare
+        # a registry per test, since the tables have the same names.
+        self.database = request.function.__name__
+        models = self._make_models()
+        classes = [declare(m, db_type='postgresql', database=self.database) for m in models]
+        configure_mappers()
+        return models, classes
+
+    def test_unchanged(self, declared):
+        assert self._callFUT() == {}
+
+    def test_reloaded(self, declared):
+        import warnings
+        from django.db import models
+        from sqlalchemy.orm import configure_mappers
+        (author, book, review, tag), (_, old_book, _, old_tag) = declared
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            new_author = type('Author', (models.Model,), {
+                '__module__': __name__,
+                'Meta': type('Meta', (), {'app_label': 'redeclare'}),
+                'name': models.CharField(max_length=10),
+                'email': models.EmailField(),
+            })
+        exports = {'Book': old_book, 'Tag': old_tag}
+        result = self._callFUT(exports=exports)
+        configure_mappers()
+        # the models referring to it are declared again, the others are kept.
+        assert list(result) == [new_author, book, review]
+        assert result[new_author].__table__.c.keys() == ['id', 'name', 'email']
+        assert result[book].author.property.mapper.class_ is result[new_author]
+        assert exports == {'Book': result[book], 'Tag': old_tag}
+
+    def test_changed_in_place(self, declared):
+        from django.db import models
+        from sqlalchemy.orm import configure_mappers
+        (author, book, review, tag), (old_author, old_book, _, _) = declared
+        models.IntegerField(null=True).contribute_to_class(book, 'pages')
+        result = self._callFUT(models=[book])
+        configure_mappers()
+        assert list(result) == [book, review]
+        assert 'pages' in result[book].__table__.c
+        # the backref made by the old class is replaced.
+        assert old_author.book.property.mapper.class_ is result[book] is not old_book
+
+    def test_unconfigured(self, request):
+        from sqlalchemy.orm import configure_mappers
+        from d2a import declare
+        self.database = request.function.__name__
+        author, book, review, tag = self._make_models()
+        for model in (author, book):
+            declare(model, db_type='postgresql', database=self.database)
+        # mappers are not configured before that.
+        author._meta.get_field('name').null = True
+        result = self._callFUT(models=[author])
+        configure_mappers()
+        assert list(result) == [author, book]
+        assert result[book].author.property.mapper.class_ is result[author]
+        assert result[author].book.property.mapper.class_ is result[book]
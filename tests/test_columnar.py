@@ -0,0 +1,80 @@
+import datetime
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+np = pytest.importorskip('numpy')
+
+
+class DummyCursor(object):
+    def __init__(self, rows):
+        self.rows = rows
+
+    def fetchmany(self, size):
+        rows, self.rows = self.rows[:size], self.rows[size:]
+        return rows
+
+
+class Test_get_dtype(object):
+    def _callFUT(self, sa_type):
+        from d2a.columnar import get_dtype
+        return get_dtype(sa_type)
+
+    @pytest.mark.parametrize(
+        'sa_type, expected',
+        [
+            (postgresql.BIGINT, 'int64'),
+            (postgresql.FLOAT(), 'float64'),
+            (postgresql.BOOLEAN, 'bool'),
+            (postgresql.TIMESTAMP, 'datetime64[us]'),
+            (postgresql.INTERVAL, 'timedelta64[us]'),
+            (postgresql.NUMERIC, 'object'),
+            (postgresql.VARCHAR, 'object'),
+        ]
+    )
+    def test_get_dtype(self, sa_type, expected):
+        assert self._callFUT(sa_type) == expected
+
+
+class Test_fetch_columns(object):
+    def _callFUT(self, cursor, columns, chunk_size):
+        from d2a.columnar import fetch_columns
+        return fetch_columns(cursor, columns, chunk_size)
+
+    @pytest.fixture()
+    def table(self):
+        return sa.Table(
+            'sales', sa.MetaData(),
+            sa.Column('id', sa.BigInteger, primary_key=True),
+            sa.Column('price', sa.Float, nullable=True),
+            sa.Column('sold', sa.DateTime, nullable=False),
+            sa.Column('tags', sa.ARRAY(sa.String)),
+        )
+
+    def test_fetch_columns(self, table):
+        sold = datetime.datetime(2020, 1, 1)
+        cursor = DummyCursor([
+            (1, 1.5, sold, ['a', 'b']),
+            (2, None, sold, None),
+            (3, 3.0, sold, ['c', 'd']),
+        ])
+        actual = self._callFUT(cursor, table.c, chunk_size=2)
+        assert list(actual) == ['id', 'price', 'sold', 'tags']
+        assert actual['id'].dtype == np.int64
+        assert not isinstance(actual['id'], np.ma.MaskedArray)
+        assert actual['id'].tolist() == [1, 2, 3]
+        assert actual['price'].tolist() == [1.5, None, 3.0]
+        assert actual['sold'].dtype == np.dtype('datetime64[us]')
+        assert actual['tags'].tolist() == [['a', 'b'], None, ['c', 'd']]
+
+    def test_grown(self, table):
+        sold = datetime.datetime(2020, 1, 1)
+        cursor = DummyCursor([(i, float(i), sold, None) for i in range(10)])
+        actual = self._callFUT(cursor, table.c, chunk_size=3)
+        assert actual['id'].tolist() == list(range(10))
+        assert not actual['price'].mask.any()
+
+    def test_empty(self, table):
+        actual = self._callFUT(DummyCursor([]), table.c, chunk_size=2)
+        assert [len(v) for v in actual.values()] == [0, 0, 0, 0]
@@ -0,0 +1,367 @@
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.dialects import sqlite
+
+
+@pytest.fixture()
+def table():
+    return sa.table('author', sa.column('id'), sa.column('name'))
+
+
+@pytest.fixture()
+def compiled_cache():
+    from d2a.db import compiled_cache
+    maxsize = compiled_cache.maxsize
+    compiled_cache.clear()
+    yield compiled_cache
+    compiled_cache.maxsize = maxsize
+    compiled_cache.clear()
+
+
+# structural cache keys of statements, which the compiled cache is keyed on.
+requires_cache_key = pytest.mark.skipif(
+    not hasattr(sa.sql.ClauseElement, '_generate_cache_key'), reason='SQLAlchemy 1.4 or later')
+
+
+class Test_compile(object):
+    def _callFUT(self, stmt, dialect=sqlite.dialect):
+        from d2a.db import _compile
+        return _compile(stmt, dialect)
+
+    def test_driver_sql(self, table, compiled_cache):
+        stmt = sa.select([table.c.name]).where(table.c.id == 1)
+        sql, params = self._callFUT(stmt)
+        assert sql == 'SELECT author.name \nFROM author \nWHERE author.id = %s'
+        assert params == (1,)
+
+    @requires_cache_key
+    def test_cache_hit(self, table, compiled_cache):
+        stmt = sa.select([table.c.name]).where(table.c.id == 1)
+        first = self._callFUT(stmt)
+        second = self._callFUT(stmt)
+        assert first == second
+        info = compiled_cache.info()
+        assert (info.hits, info.misses, info.currsize) == (1, 1, 1)
+
+    @requires_cache_key
+    def test_eviction(self, table, compiled_cache):
+        compiled_cache.maxsize = 1
+        stmt1 = sa.select([table.c.name])
+        stmt2 = sa.select([table.c.id])
+        self._callFUT(stmt1)
+        self._callFUT(stmt2)
+        self._callFUT(stmt1)
+        info = compiled_cache.info()
+        assert (info.hits, info.misses, info.evictions, info.currsize) == (0, 3, 2, 1)
+
+    @requires_cache_key
+    def test_disabled(self, table, compiled_cache):
+        compiled_cache.maxsize = 0
+        stmt = sa.select([table.c.name])
+        self._callFUT(stmt)
+        self._callFUT(stmt)
+        info = compiled_cache.info()
+        assert (info.hits, info.misses, info.currsize) == (0, 2, 0)
+
+    def test_changed_in_place(self, table, compiled_cache):
+        stmt = sa.select([table.c.name])
+        assert self._callFUT(stmt) == ('SELECT author.name \nFROM author', ())
+        stmt.append_whereclause(table.c.id == 5)
+        assert self._callFUT(stmt) == ('SELECT author.name \nFROM author \nWHERE author.id = %s', (5,))
+
+    def test_callable_bindparam(self, table, compiled_cache):
+        values = iter([1, 2])
+        stmt = sa.select([table.c.name]).where(table.c.id == sa.bindparam('id', callable_=lambda: next(values)))
+        assert self._callFUT(stmt)[1] == (1,)
+        assert self._callFUT(stmt)[1] == (2,)
+
+    def test_legacy_converter(self, table, compiled_cache, monkeypatch):
+        from d2a.db import DIALECT_MAPPING
+        # the former contract, returning driver params instead of the function extracting them.
+        monkeypatch.setitem(DIALECT_MAPPING, sqlite.dialect, lambda sql, binded: (
+            sql.replace('?', '%s'), tuple(binded.params.values())))
+        with pytest.warns(DeprecationWarning):
+            assert self._callFUT(sa.select([table.c.name]).where(table.c.id == 1))[1] == (1,)
+            assert self._callFUT(sa.select([table.c.name]).where(table.c.id == 2))[1] == (2,)
+
+
+@pytest.fixture()
+def engines():
+    from d2a.db import dispose_engines, _engines
+    dispose_engines()
+    yield _engines
+    dispose_engines()
+
+
+class Test_Dialects(object):
+    def _makeOne(self):
+        from d2a.db import _Dialects
+        return _Dialects()
+
+    def test_lazy(self):
+        dialects = self._makeOne()
+        assert 'postgresql' in dialects and 'sqlite3' in dialects and 'unknown' not in dialects
+        assert not dialects._loaded
+
+    def test_alias(self):
+        dialects = self._makeOne()
+        assert dialects['sqlite3'] is dialects['sqlite'] is sqlite.dialect
+        with pytest.raises(KeyError):
+            dialects['unknown']
+
+
+class Test_make_engine(object):
+    def _callFUT(self, db_type, **options):
+        from d2a.db import make_engine
+        return make_engine(db_type, **options)
+
+    def test_engine_shared(self, engines):
+        assert self._callFUT('sqlite+memory') is self._callFUT('sqlite+memory')
+        assert len(engines) == 1
+
+    def test_engine_per_options(self, engines):
+        engine = self._callFUT('sqlite+memory')
+        assert self._callFUT('sqlite+memory', echo=True) is not engine
+        assert len(engines) == 2
+
+
+class Test_make_session(object):
+    def _callFUT(self, engine, **kwargs):
+        from d2a.db import make_session
+        return make_session(engine, **kwargs)
+
+    def test_sessionmaker_shared(self, engines):
+        from d2a.db import make_engine
+        engine = make_engine('sqlite+memory')
+        with self._callFUT(engine) as session1:
+            pass
+        with self._callFUT('sqlite+memory') as session2:
+            pass
+        assert type(session1) is type(session2)
+        assert session2.bind is engine
+
+
+class Test_after_fork_in_child(object):
+    def _callFUT(self):
+        from d2a.db import _after_fork_in_child
+        return _after_fork_in_child()
+
+    def test_pool_recreated(self, engines):
+        from d2a.db import make_engine, _inherited_pools
+        engine = make_engine('sqlite+memory')
+        pool = engine.pool
+        self._callFUT()
+        assert engine.pool is not pool
+        assert _inherited_pools[-1] is pool
+        assert make_engine('sqlite+memory') is engine
+
+
+class Test_Row(object):
+    def _makeOne(self, fields, values):
+        from d2a.db import _row_class
+        return _row_class(fields)(values)
+
+    def test_access(self):
+        row = self._makeOne(('id', 'name'), (1, 'a'))
+        assert (row['name'], row[0], row.name, row.get('age', 10)) == ('a', 1, 'a', 10)
+        assert row.items() == [('id', 1), ('name', 'a')]
+        assert dict(row) == {'id': 1, 'name': 'a'}
+
+    def test_equality(self):
+        row = self._makeOne(('id', 'name'), (1, 'a'))
+        assert row == {'id': 1, 'name': 'a'}
+        assert {'id': 1, 'name': 'a'} == row
+        assert row == (1, 'a')
+        assert row != {'id': 1}
+
+    def test_class_shared(self):
+        row1 = self._makeOne(('id', 'name'), (1, 'a'))
+        row2 = self._makeOne(('id', 'name'), (2, 'b'))
+        assert type(row1) is type(row2)
+        assert not hasattr(row1, '__dict__')
+
+    def test_pickle(self):
+        import pickle
+        row = self._makeOne(('id', 'name'), (1, 'a'))
+        actual = pickle.loads(pickle.dumps(row))
+        assert actual == row
+        assert actual.name == 'a'
+
+
+
+def _run(coroutine):
+    import asyncio
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+class Test_sync_to_async(object):
+    def _callFUT(self, func):
+        from d2a.db import _sync_to_async
+        return _sync_to_async(func)
+
+    def test_same_thread(self):
+        import threading
+        func = self._callFUT(lambda: threading.get_ident())
+        assert _run(func()) == _run(func())
+        assert _run(func()) != threading.get_ident()
+
+    def test_without_asgiref(self, monkeypatch):
+        import threading
+        from d2a import db
+        monkeypatch.setattr(db, 'sync_to_async', None)
+        monkeypatch.setattr(db, '_sync_executor', None)
+        func = self._callFUT(lambda a, b=0: (a + b, threading.get_ident()))
+        (result1, ident1), (result2, ident2) = _run(func(1, b=2)), _run(func(3))
+        assert (result1, result2) == (3, 3)
+        assert ident1 == ident2 != threading.get_ident()
+
+
+class Test_AsyncRows(object):
+    def _makeOne(self, rows, chunk_size):
+        from d2a.db import AsyncRows
+        return AsyncRows(rows, chunk_size)
+
+    def test_iteration(self):
+        fetched = []
+
+        def rows():
+            for i in range(5):
+                fetched.append(i)
+                yield i
+
+        async def consume(async_rows):
+            actual = []
+            async for row in async_rows:
+                actual.append((row, len(fetched)))
+            return actual
+
+        actual = _run(consume(self._makeOne(rows(), 2)))
+        assert actual == [(0, 2), (1, 2), (2, 4), (3, 4), (4, 5)]
+
+
+class Test_stream_expression(object):
+    def _callFUT(self, stmt, conn):
+        from d2a.db import stream_expression
+        return stream_expression(stmt, conn=conn, dialect='sqlite')
+
+    @pytest.fixture()
+    def conn(self):
+        import sqlite3
+
+        class Connection(object):
+            vendor = 'sqlite'
+            connection = sqlite3.connect(':memory:')
+
+            def chunked_cursor(self):
+                return self.connection.cursor()
+
+        yield Connection()
+        Connection.connection.close()
+
+    def test_rows(self, conn, table):
+        conn.connection.execute('CREATE TABLE author (id integer, name text)')
+        conn.connection.execute("INSERT INTO author VALUES (1, 'a')")
+        with self._callFUT(sa.select([table.c.id, table.c.name]), conn) as rows:
+            assert list(rows) == [{'id': 1, 'name': 'a'}]
+
+    def test_error(self, conn, table):
+        import sqlite3
+        # the error of the statement, not of fetching from the cursor.
+        with pytest.raises(sqlite3.OperationalError, match='no such table'):
+            with self._callFUT(sa.select([table.c.id]), conn) as rows:
+                list(rows)
+
+
+class Test_execute_values(object):
+    def _callFUT(self, stmt, params_list):
+        from sqlalchemy.dialects import postgresql
+        from d2a.db import _execute_values, _EXECUTEMANY_COMPILE_KWARGS
+        sql = str(stmt.compile(
+            dialect=postgresql.dialect(), column_keys=list(params_list[0]), **_EXECUTEMANY_COMPILE_KWARGS))
+        return _execute_values(self.cursor, stmt, sql, params_list)
+
+    @pytest.fixture(autouse=True)
+    def cursor(self, monkeypatch):
+        import types
+        psycopg2_extras = pytest.importorskip('psycopg2.extras')
+        calls = self.calls = []
+        self.cursor = types.SimpleNamespace(
+            cursor='raw', rowcount=2, executemany=lambda sql, params_list: calls.append(('executemany', sql)))
+        monkeypatch.setattr(psycopg2_extras, 'execute_values', lambda cursor, sql, params_list, **kwargs: calls.append(
+            ('execute_values', sql, kwargs['template'])))
+
+    @pytest.fixture()
+    def table(self):
+        return sa.Table('author', sa.MetaData(), sa.Column('id', sa.Integer, primary_key=True), sa.Column('name', sa.Text))
+
+    def test_values(self, table):
+        assert self._callFUT(table.insert().values(name=sa.bindparam('name')), [{'name': 'a'}] * 2) == 2
+        assert self.calls == [
+            ('execute_values', 'INSERT INTO author (name) VALUES %s', '(%(name)s)'),
+        ]
+
+    def test_on_conflict(self, table):
+        from sqlalchemy.dialects.postgresql import insert
+        stmt = insert(table).values(id=sa.bindparam('id'), name=sa.func.upper(sa.bindparam('name')))
+        self._callFUT(stmt.on_conflict_do_nothing(), [{'id': 1, 'name': 'a'}])
+        # the rest follows the rows, not repeated per row.
+        assert self.calls == [(
+            'execute_values',
+            'INSERT INTO author (id, name) VALUES %s ON CONFLICT DO NOTHING',
+            '(%(id)s, upper(%(name)s))',
+        )]
+
+    @pytest.mark.parametrize('tail', ['returning', 'on_conflict_do_update'])
+    def test_fallback(self, table, tail):
+        from sqlalchemy.dialects.postgresql import insert
+        stmt = insert(table).values(name=sa.bindparam('name'))
+        if tail == 'returning':
+            stmt = stmt.returning(table.c.id)
+        else:
+            stmt = stmt.on_conflict_do_update(index_elements=['id'], set_={'name': 'b'})
+        self._callFUT(stmt, [{'name': 'a'}])
+        assert [call[0] for call in self.calls] == ['executemany']
+
+
+class Test_query_many(object):
+    def _callFUT(self, stmts, **kwargs):
+        from d2a.db import query_many
+        return query_many(stmts, **kwargs)
+
+    @pytest.fixture()
+    def query_expression(self, monkeypatch):
+        import time
+        from d2a import db
+
+        def query_expression(stmt, **kwargs):
+            assert kwargs['raise_error'] and kwargs['as_row_list']
+            time.sleep(stmt['sleep'])
+            if 'error' in stmt:
+                raise stmt['error']
+            return [stmt['value']]
+        monkeypatch.setattr(db, 'query_expression', query_expression)
+
+    def test_ordered_and_concurrent(self, query_expression):
+        import time
+        stmts = [{'sleep': 0.2 - i * 0.05, 'value': i} for i in range(4)]
+        start = time.perf_counter()
+        results = self._callFUT(stmts, max_workers=4)
+        assert time.perf_counter() - start < 0.4
+        assert [r.result for r in results] == [[0], [1], [2], [3]]
+        assert all(r.error is None and r.elapsed >= s['sleep'] for r, s in zip(results, stmts))
+
+    def test_error(self, query_expression):
+        error = ValueError('x')
+        stmts = [{'sleep': 0, 'value': 0}, {'sleep': 0, 'error': error}]
+        results = self._callFUT(stmts, max_workers=2)
+        assert [r.result for r in results] == [[0], None]
+        assert results[1].error is error
+        with pytest.raises(ValueError):
+            self._callFUT(stmts, max_workers=2, raise_error=True)
+
+    def test_empty(self):
+        assert self._callFUT([]) == []
@@ -0,0 +1,83 @@
+import datetime
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+pa = pytest.importorskip('pyarrow')
+
+
+class Test_arrow_type(object):
+    def _callFUT(self, sa_type):
+        from d2a.exports import arrow_type
+        return arrow_type(pa, sa_type)
+
+    @pytest.mark.parametrize(
+        'sa_type, expected',
+        [
+            (postgresql.BIGINT, pa.int64()),
+            (postgresql.FLOAT(), pa.float64()),
+            (postgresql.NUMERIC(10, 2), pa.decimal128(10, 2)),
+            (postgresql.TIMESTAMP(timezone=True), pa.timestamp('us', tz='UTC')),
+            (postgresql.VARCHAR(10), pa.string()),
+            (postgresql.ARRAY(postgresql.INTEGER), pa.list_(pa.int64())),
+            (postgresql.UUID, pa.string()),
+            (postgresql.JSONB, pa.string()),
+        ]
+    )
+    def test_arrow_type(self, sa_type, expected):
+        actual, _ = self._callFUT(sa_type)
+        assert actual == expected
+
+    def test_converter(self):
+        _, convert = self._callFUT(postgresql.JSONB)
+        assert convert({'a': 1}) == '{"a": 1}'
+
+
+class Test_write_batches(object):
+    def _callFUT(self, rows, columns, path, **kwargs):
+        from d2a.exports import write_batches
+        return write_batches(rows, columns, path, **kwargs)
+
+    @pytest.fixture()
+    def table(self):
+        return sa.Table(
+            'sales', sa.MetaData(),
+            sa.Column('id', sa.BigInteger, primary_key=True),
+            sa.Column('sold', sa.DateTime),
+            sa.Column('price', postgresql.JSONB),
+        )
+
+    @pytest.fixture()
+    def rows(self):
+        sold = datetime.datetime(2020, 1, 1)
+        return [(1, sold, {'yen': 100}), (2, None, None), (3, sold, [1])]
+
+    def test_parquet(self, tmpdir, table, rows):
+        import pyarrow.parquet as pq
+        path = str(tmpdir.join('sales.parquet'))
+        assert self._callFUT(iter(rows), table.c, path, batch_size=2) == 3
+        actual = pq.read_table(path)
+        assert actual.column_names == ['id', 'sold', 'price']
+        assert actual.column('price').to_pylist() == ['{"yen": 100}', None, '[1]']
+
+    def test_feather(self, tmpdir, table, rows):
+        import pyarrow.feather as feather
+        path = str(tmpdir.join('sales.feather'))
+        assert self._callFUT(rows, table.c, path) == 3
+        actual = feather.read_table(path)
+        assert actual.column('id').to_pylist() == [1, 2, 3]
+
+
+class TestExportCommand(object):
+    def _makeOne(self):
+        from d2a.management.commands.d2a_export import Command
+        return Command()
+
+    def test_database(self, monkeypatch):
+        from django.contrib.auth.models import Group
+        from d2a import db, get_registry
+        monkeypatch.setattr(db, '_detect_db_type', lambda database='default': {'export': 'mysql'}[database])
+        stmt = self._makeOne().get_statement('auth.Group', 'id,name', database='export')
+        # the table is made for the dialect of the database, not in the default registry.
+        assert stmt.froms == [get_registry('mysql', 'export').tables[Group]]
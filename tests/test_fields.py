@@ -21,3 +21,94 @@ class Test_alias(object):
         self._callFUT(newfield, charfield)
         from d2a.fields import mapping
         assert newfield in mapping
+
+
+class Test_resolve(object):
+    def _callFUT(self, field_type):
+        from d2a.fields import resolve
+        return resolve(field_type)
+
+    def test_nearest_class(self):
+        from django.db.models import EmailField, CharField
+        from d2a.fields import mapping
+
+        class CustomEmailField(EmailField):
+            pass
+
+        class MoreCustomEmailField(CustomEmailField):
+            pass
+        assert self._callFUT(MoreCustomEmailField) is mapping[EmailField] is not mapping[CharField]
+
+    def test_unknown(self):
+        from django.db.models import Field
+
+        class UnknownField(Field):
+            pass
+        assert self._callFUT(UnknownField) is None
+
+    def test_memoized_until_alias(self):
+        from django.db.models import CharField, TextField
+        from d2a.fields import alias, mapping
+
+        class NewField(CharField):
+            pass
+        assert self._callFUT(NewField) is mapping[CharField]
+        alias(NewField, TextField)
+        assert self._callFUT(NewField) is mapping[TextField]
+
+
+class Test_load_type(object):
+    def _callFUT(self, col_type):
+        from d2a.fields import load_type
+        return load_type(col_type)
+
+    def test_type_ref(self):
+        from sqlalchemy.dialects import mysql
+        from d2a.fields import mysql_types
+        assert mysql_types.INTEGER is mysql_types.INTEGER
+        assert self._callFUT(mysql_types.INTEGER) is mysql.INTEGER
+
+    def test_type_class(self):
+        from sqlalchemy.types import VARCHAR
+        assert self._callFUT(VARCHAR) is VARCHAR
+
+
+class Test_load_optional_rules(object):
+    def _callFUT(self):
+        from d2a.fields import load_optional_rules
+        return load_optional_rules()
+
+    def test_imported_module(self):
+        from django.contrib.postgres.fields import ArrayField
+        from d2a.fields import mapping
+        self._callFUT()
+        assert ArrayField in mapping
+
+    def test_concurrent(self, monkeypatch):
+        import sys
+        import threading
+        import time
+        import types
+        from d2a import fields
+        loaded = []
+
+        def load():
+            time.sleep(0.1)
+            loaded.append(threading.current_thread())
+
+        monkeypatch.setitem(sys.modules, 'd2a_optional_fields', types.ModuleType('d2a_optional_fields'))
+        monkeypatch.setitem(fields._optional_rules, 'd2a_optional_fields', load)
+        seen = []
+
+        def target():
+            self._callFUT()
+            seen.append(len(loaded))
+
+        threads = [threading.Thread(target=target) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # loaded once, and no thread returned before that.
+        assert len(loaded) == 1
+        assert seen == [1] * 4
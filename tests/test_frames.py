@@ -0,0 +1,68 @@
+import pytest
+
+pd = pytest.importorskip('pandas')
+np = pytest.importorskip('numpy')
+
+
+class Test_to_series_data(object):
+    def _callFUT(self, array):
+        from d2a.frames import _to_series_data
+        return pd.Series(_to_series_data(pd, array))
+
+    @pytest.mark.parametrize(
+        'data, dtype, expected_dtype',
+        [
+            ([1, 0, 3], 'int64', 'Int64'),
+            ([True, False, True], 'bool', 'boolean'),
+        ]
+    )
+    def test_nullable(self, data, dtype, expected_dtype):
+        array = np.ma.MaskedArray(np.array(data, dtype), mask=[False, True, False])
+        actual = self._callFUT(array)
+        assert str(actual.dtype) == expected_dtype
+        assert actual.isna().tolist() == [False, True, False]
+
+    def test_float(self):
+        array = np.ma.MaskedArray(np.array([1.5, 0.0]), mask=[False, True])
+        actual = self._callFUT(array)
+        assert actual.dtype == np.float64
+        assert actual.isna().tolist() == [False, True]
+
+    def test_not_masked(self):
+        actual = self._callFUT(np.array([1, 2]))
+        assert actual.dtype == np.int64
+
+
+class Test_frame_rows(object):
+    def _callFUT(self, df, batch_size):
+        from d2a.frames import _frame_rows
+        return list(_frame_rows(df, batch_size))
+
+    def test_frame_rows(self):
+        df = pd.DataFrame({
+            'price': [1.5, np.nan, 3.0],
+            'age': pd.array([1, None, 3], dtype='Int64'),
+            'name': ['a', None, 'c'],
+        })
+        actual = self._callFUT(df, batch_size=2)
+        assert actual == [(1.5, 1, 'a'), (None, None, None), (3.0, 3, 'c')]
+        assert type(actual[0][1]) is int
+
+    def test_datetime(self):
+        import datetime
+        df = pd.DataFrame({
+            'created': pd.to_datetime(['2020-01-02 03:04:05', None]),
+            'updated': pd.to_datetime(['2020-01-02 03:04:05', None]).tz_localize('UTC'),
+            'elapsed': pd.to_timedelta(['1 days', None]),
+        })
+        actual = self._callFUT(df, batch_size=10)
+        assert actual == [
+            (
+                datetime.datetime(2020, 1, 2, 3, 4, 5),
+                datetime.datetime(2020, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc),
+                datetime.timedelta(days=1),
+            ),
+            (None, None, None),
+        ]
+        # not subclasses of pandas, which the drivers (e.g. sqlite3) can't bind.
+        assert [type(v) for v in actual[0]] == [datetime.datetime, datetime.datetime, datetime.timedelta]
@@ -0,0 +1,97 @@
+import pytest
+
+
+class Test_render_value(object):
+    def _callFUT(self, value, imports, fallback=None):
+        from d2a.generator import render_value
+        return render_value(value, imports, fallback)
+
+    @pytest.fixture()
+    def imports(self):
+        from d2a.generator import Imports
+        return Imports()
+
+    def test_literals(self, imports):
+        assert self._callFUT({'a': [1, None]}, imports) == "{'a': [1, None]}"
+        assert self._callFUT(('x',), imports) == "('x',)"
+        assert not imports.aliases
+
+    def test_shortest_module(self, imports):
+        from sqlalchemy.dialects.postgresql import ARRAY
+        from sqlalchemy.sql.sqltypes import INTEGER
+        assert self._callFUT(INTEGER, imports) == 'sqlalchemy.INTEGER'
+        assert self._callFUT(ARRAY, imports) == 'postgresql.ARRAY'
+        assert imports.render() == ['import sqlalchemy', 'from sqlalchemy.dialects import postgresql']
+
+    def test_fallback(self, imports):
+        assert self._callFUT(lambda: 1, imports, fallback='default') == 'default'
+        with pytest.raises(ValueError):
+            self._callFUT(lambda: 1, imports)
+
+
+class TestImports(object):
+    def _makeOne(self, reserved=()):
+        from d2a.generator import Imports
+        return Imports(reserved)
+
+    def test_collision(self):
+        imports = self._makeOne(reserved=['timezone'])
+        assert imports.alias('django.utils.timezone') == 'django_utils_timezone'
+        assert imports.alias('sqlalchemy.orm') == 'orm'
+        assert imports.alias('sqlalchemy.orm') == 'orm'
+        assert imports.render() == [
+            'from django.utils import timezone as django_utils_timezone',
+            'from sqlalchemy import orm',
+        ]
+
+
+class Test_generate(object):
+    def _callFUT(self, app_config, **kwargs):
+        from d2a.generator import generate
+        return generate(app_config, 'postgresql', **kwargs)
+
+    def test_declares_same_classes(self):
+        from django.apps import apps
+        from d2a import declare
+        from d2a.generator import HEADER
+        source = self._callFUT(apps.get_app_config('auth'))
+        assert HEADER in source
+
+        namespace = {}
+        exec(compile(source, 'auth/models_sqla.py', 'exec'), namespace)
+        user = declare(apps.get_model('auth.User'))
+        assert namespace['User'] is user
+        assert namespace['UserGroups'].__table__.c.keys() == ['id', 'user_id', 'group_id']
+        assert user.__table__.c.keys() == [f.column for f in apps.get_model('auth.User')._meta.fields]
+
+    def test_as_table(self):
+        from django.apps import apps
+        source = self._callFUT(apps.get_app_config('contenttypes'), as_table=True, name_formatter=str.upper)
+        namespace = {}
+        exec(source, namespace)
+        assert namespace['CONTENTTYPE'].name == 'django_content_type'
+
+
+class TestGenerateCommand(object):
+    def _callFUT(self, *args):
+        from django.core.management import call_command
+        from d2a.management.commands.d2a_generate import Command
+        return call_command(Command(), *args)
+
+    def test_models_package(self, tmp_path, monkeypatch):
+        import types
+        from d2a import generator
+        from d2a.management.commands.d2a_generate import Command
+        models = tmp_path / 'app' / 'models'
+        models.mkdir(parents=True)
+        (models / '__init__.py').write_text('')
+        models_module = types.ModuleType('app.models')
+        models_module.__file__ = str(models / '__init__.py')
+        app_config = types.SimpleNamespace(path=str(tmp_path / 'app'), models_module=models_module)
+        monkeypatch.setattr(Command, 'get_app_configs', lambda self, app_labels: [app_config])
+        monkeypatch.setattr(generator, 'generate', lambda app_config, **kwargs: generator.HEADER + '\n')
+
+        self._callFUT('app')
+        # `autoload` imports `app.models_sqla`, not `app.models.models_sqla`.
+        assert (tmp_path / 'app' / 'models_sqla.py').read_text() == generator.HEADER + '\n'
+        assert not (models / 'models_sqla.py').exists()
@@ -0,0 +1,70 @@
+import datetime
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+class Test_serializer(object):
+    def _callFUT(self, sa_type):
+        from d2a.loaders import serializer
+        return serializer(sa_type)
+
+    @pytest.mark.parametrize(
+        'sa_type, value, expected',
+        [
+            (postgresql.INTEGER, 1, '1'),
+            (postgresql.BOOLEAN, False, 'f'),
+            (postgresql.BYTEA, b'\x00\xff', '\\x00ff'),
+            (postgresql.JSONB, {'a': [1, None]}, '{"a": [1, null]}'),
+            (postgresql.TIMESTAMP, datetime.datetime(2020, 1, 2, 3, 4, 5), '2020-01-02T03:04:05'),
+            (postgresql.INTERVAL, datetime.timedelta(days=1, seconds=2), '1 days 2 seconds 0 microseconds'),
+            (postgresql.ARRAY(postgresql.VARCHAR), ['a"b', None, 'c,d'], '{"a\\"b",NULL,"c,d"}'),
+            (postgresql.ARRAY(postgresql.INTEGER), [[1, 2], [3, 4]], '{{"1","2"},{"3","4"}}'),
+            (postgresql.HSTORE, {'k': 'v', 'n': None}, '"k"=>"v","n"=>NULL'),
+            (postgresql.INT4RANGE, (1, None), '["1",)'),
+        ]
+    )
+    def test_serializer(self, sa_type, value, expected):
+        assert self._callFUT(sa_type)(value) == expected
+
+
+class Test_CopyReader(object):
+    def _makeOne(self, lines):
+        from d2a.loaders import CopyReader
+        return CopyReader(lines)
+
+    def test_read_by_size(self):
+        reader = self._makeOne(['abc\n', 'de\n', 'f\n'])
+        assert [reader.read(4), reader.read(4), reader.read(4)] == ['abc\n', 'de\nf', '\n']
+        assert reader.read(4) == ''
+
+    def test_read_all(self):
+        reader = self._makeOne(['abc\n', 'de\n'])
+        assert reader.read() == 'abc\nde\n'
+
+
+class Test_csv_lines(object):
+    def _callFUT(self, table, rows, columns=None):
+        from d2a.loaders import _resolve_columns, _csv_lines
+        columns, rows, defaults = _resolve_columns(table, iter(rows), columns)
+        return [c.key for c in columns], list(_csv_lines(columns, rows, defaults))
+
+    @pytest.fixture()
+    def table(self):
+        return sa.Table(
+            'author', sa.MetaData(),
+            sa.Column('id', sa.Integer, primary_key=True),
+            sa.Column('name', sa.String(10)),
+            sa.Column('age', sa.Integer, default=20),
+        )
+
+    def test_dict_rows(self, table):
+        keys, lines = self._callFUT(table, [{'name': 'a"b'}, {'name': '', 'age': None}])
+        assert keys == ['name', 'age']
+        assert lines == ['"a""b","20"\n', '"",\n']
+
+    def test_tuple_rows(self, table):
+        keys, lines = self._callFUT(table, [(1, 'a', 10)])
+        assert keys == ['id', 'name', 'age']
+        assert lines == ['"1","a","10"\n']
@@ -0,0 +1,84 @@
+import pytest
+
+
+class Test_get_dependencies(object):
+    def _callFUT(self, model):
+        from d2a.parsers import get_dependencies
+        return get_dependencies(model)
+
+    def test_foreign_key(self):
+        from django.contrib.auth.models import Permission
+        from django.contrib.contenttypes.models import ContentType
+        assert self._callFUT(Permission) == [ContentType]
+
+    def test_many_to_many(self):
+        from django.contrib.auth.models import User, Group, Permission
+        assert self._callFUT(User) == [User.groups.through, Group, User.user_permissions.through, Permission]
+
+    def test_reverse_ignored(self):
+        from django.contrib.contenttypes.models import ContentType
+        assert self._callFUT(ContentType) == []
+
+
+class Test_parse_field(object):
+    def _callFUT(self, field):
+        from d2a.parsers import parse_field
+        return parse_field(field)
+
+    def test_subclass_without_warning(self, recwarn):
+        from django.db.models import EmailField
+
+        class CustomEmailField(EmailField):
+            pass
+        info = self._callFUT(CustomEmailField(max_length=100))
+        assert info['__postgresql_type_kwargs__'] == {'length': 100}
+        assert not recwarn.list
+
+
+class TestFieldInfo(object):
+    def _makeOne(self, info):
+        from d2a.parsers import FieldInfo
+        return FieldInfo(info)
+
+    def test_mapping(self):
+        info = self._makeOne({'nullable': True, '__fk_kwargs__': {'column': 'book.id'}})
+        assert info['nullable'] is True
+        assert info.get('missing', 1) == 1
+        assert '__fk_kwargs__' in info and 'missing' not in info
+        assert dict(info['__fk_kwargs__']) == {'column': 'book.id'}
+        assert info == {'nullable': True, '__fk_kwargs__': {'column': 'book.id'}}
+        with pytest.raises(TypeError):
+            info['nullable'] = False
+
+    def test_slots(self):
+        info = self._makeOne({'nullable': True})
+        assert not hasattr(info, '__dict__')
+        assert self._makeOne({'nullable': False})._index is info._index
+
+    def test_nested_not_kept(self):
+        import gc
+        import weakref
+
+        class Model(object):
+            pass
+
+        info = self._makeOne({'__rel_kwargs__': {'__secondary_model__': Model}})
+        assert self._makeOne({'__rel_kwargs__': {'__secondary_model__': Model}})['__rel_kwargs__'] is info['__rel_kwargs__']
+        ref = weakref.ref(Model)
+        del info, Model
+        gc.collect()
+        assert ref() is None
+
+
+class Test_parse_model(object):
+    def _callFUT(self, model):
+        from d2a.parsers import parse_model
+        return parse_model(model)
+
+    def test_field_info(self):
+        from django.contrib.auth.models import Group
+        from d2a.parsers import FieldInfo
+        info = self._callFUT(Group)
+        assert info['table_name'] == 'auth_group'
+        assert all(isinstance(fields, FieldInfo) for fields in info['fields'].values())
+        assert info['fields']['name']['__default_type_kwargs__'] == {'length': 150}
@@ -0,0 +1,64 @@
+import json
+
+import pytest
+
+
+class Test_measure(object):
+    def _callFUT(self, kind, key):
+        from d2a.profiling import measure
+        return measure(kind, key)
+
+    def test_not_profiling(self):
+        from d2a import profiling
+        assert profiling.current is None
+        with self._callFUT('parse', 'x'):
+            pass
+
+    def test_profiling(self):
+        from d2a import profiling
+        profiler = profiling.start(trace_memory=False)
+        try:
+            with self._callFUT('field', str):
+                pass
+            with self._callFUT('field', str):
+                pass
+        finally:
+            assert profiling.stop() is profiler
+        assert profiler.records['field'][str][0] == 2
+        assert profiling.current is None
+
+
+class Test_profile_apps(object):
+    def _callFUT(self, app_configs, **kwargs):
+        from d2a.profiling import profile_apps
+        return profile_apps(app_configs, db_type='postgresql', **kwargs)
+
+    @pytest.fixture()
+    def app_configs(self):
+        from django.apps import apps
+        return [apps.get_app_config('auth'), apps.get_app_config('contenttypes')]
+
+    def test_report(self, app_configs):
+        import d2a
+        from django.contrib.auth.models import User
+        registry = d2a.get_registry('postgresql')
+        profiler = self._callFUT(app_configs)
+        assert d2a.get_registry('postgresql') is registry
+
+        report = profiler.report()
+        assert {row['name'] for row in report['app']} == {'auth', 'contenttypes'}
+        seconds = [row['seconds'] for row in report['model']]
+        assert seconds == sorted(seconds, reverse=True)
+        user = next(row for row in report['model'] if row['name'] == 'auth.User')
+        assert user['parse'] > 0 and user['declare'] > 0 and user['mapper'] > 0
+        assert user['seconds'] == pytest.approx(user['parse'] + user['declare'] + user['mapper'])
+        assert user['bytes'] > 0
+        assert 'django.db.models.fields.CharField' in [row['name'] for row in report['field']]
+        assert 'auth.User' in profiler.format(limit=100)
+
+    def test_dump(self, app_configs, tmpdir):
+        path = str(tmpdir.join('profile.json'))
+        self._callFUT(app_configs, trace_memory=False).dump(path, sort='bytes')
+        with open(path) as f:
+            report = json.load(f)
+        assert list(report) == ['app', 'model', 'field']